@@ -2,7 +2,14 @@
 Octopus - A flexible CICD infrastructure toolkit for test orchestration and container management
 """
 
-from . import core, dsl, orchestration
+import importlib
 
 __version__ = "0.1.0"
-__all__ = ["core", "dsl", "orchestration", "integrations"]
+__all__ = ["core", "dsl", "orchestration", "ext_api"]
+
+
+def __getattr__(name: str):
+    """Import subpackages lazily on first attribute access (PEP 562)"""
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
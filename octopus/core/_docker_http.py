@@ -0,0 +1,101 @@
+"""
+Minimal Docker Engine API client over the UNIX socket for the per-test hot path (create, start, wait)
+"""
+
+import asyncio
+import atexit
+import os
+import weakref
+from typing import Any
+
+import aiohttp
+from aiodocker.exceptions import DockerError
+from loguru import logger
+
+DOCKER_SOCKET = os.getenv("DOCKER_SOCKET", "/var/run/docker.sock")
+_BASE_URL = "http://docker"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class DockerHTTPError(DockerError):
+    """Docker Engine API error response, raised as DockerError so callers handle both clients alike"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+
+
+# keep-alive session per event loop, aiohttp sessions can not be shared across loops
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the keep-alive session to the docker socket of the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None:
+        session = _sessions[loop] = aiohttp.ClientSession(
+            connector=aiohttp.UnixConnector(path=DOCKER_SOCKET), base_url=_BASE_URL
+        )
+    return session
+
+
+async def close() -> None:
+    """Close the session of the running event loop"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _close_sessions() -> None:
+    """Close the sessions left open on interpreter exit"""
+    for session in list(_sessions.values()):
+        try:
+            asyncio.run(session.close())
+        except Exception:
+            logger.exception("Failed to close docker socket session")
+    _sessions.clear()
+
+
+atexit.register(_close_sessions)
+
+
+async def _request(method: str, path: str, **kwargs: Any) -> Any:
+    """Send a request to the docker daemon, return the decoded JSON body if any"""
+    async with get_session().request(method, path, **kwargs) as resp:
+        if resp.status >= 400:
+            try:
+                message = (await resp.json()).get("message", resp.reason)
+            except (aiohttp.ContentTypeError, ValueError):
+                message = await resp.text()
+            raise DockerHTTPError(resp.status, message)
+        if resp.content_type == "application/json":
+            return await resp.json()
+        return None
+
+
+async def create(name: str, body: bytes) -> str:
+    """Create a container
+
+    Args:
+        name: container name
+        body: JSON encoded container create config
+
+    Returns:
+        str: the container ID
+
+    Raises:
+        DockerHTTPError: status 409 if the name is already used by another container, it is left untouched
+    """
+    res = await _request("POST", "/containers/create", params={"name": name}, data=body, headers=_JSON_HEADERS)
+    return res["Id"]
+
+
+async def start(cid: str) -> None:
+    """Start a container, no-op if it is already running"""
+    await _request("POST", f"/containers/{cid}/start")
+
+
+async def wait(cid: str) -> int:
+    """Block until a container stops, return its exit code"""
+    res = await _request("POST", f"/containers/{cid}/wait")
+    return res["StatusCode"]
@@ -3,11 +3,14 @@ Base container service implementation
 """
 
 from abc import ABC, abstractmethod
+from typing import Any
 
 
 class Container(ABC):
     """Abstract base class for container services"""
 
+    __slots__ = ("name", "image", "container_id")
+
     name: str
     image: str
     container_id: str | None
@@ -19,41 +22,41 @@ class Container(ABC):
         self.container_id: str | None = None
 
     @abstractmethod
-    def run(self) -> str:
+    async def run(self) -> str:
         """Run container and return the container ID"""
         ...
 
     @abstractmethod
-    def start(self) -> None:
+    async def start(self) -> None:
         """Start the container"""
         ...
 
     @abstractmethod
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """Stop the container"""
         ...
 
     @abstractmethod
-    def pause(self) -> None:
+    async def pause(self) -> None:
         """Pause the container"""
         ...
 
     @abstractmethod
-    def remove(self) -> None:
+    async def remove(self) -> None:
         """Remove the container"""
         ...
 
     @abstractmethod
-    def get_logs(self) -> list[str]:
-        """Get container logs"""
+    async def get_logs(self, tail: int = 1000) -> list[str]:
+        """Get the last `tail` lines of container logs"""
         ...
 
     @abstractmethod
-    def is_healthy(self) -> bool:
+    async def is_healthy(self) -> bool:
         """Check if the container is healthy"""
         ...
 
     @abstractmethod
-    def get_container_info(self) -> dict[str, str]:
+    async def get_container_info(self) -> dict[str, Any]:
         """Get container information"""
         ...
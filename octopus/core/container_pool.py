@@ -0,0 +1,133 @@
+"""
+Warm container pool, reuse containers across service runs instead of create/remove per run
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import aiodocker
+import orjson
+from aiodocker.containers import DockerContainer
+from aiodocker.exceptions import DockerError
+from loguru import logger
+
+
+class ContainerPool:
+    """Pool of idle containers keyed by container name and create config.
+
+    Released containers are stopped and kept instead of being removed, the next acquire with
+    the same name and config restarts the idle container, which skips image layer setup and
+    the slow container removal path. All pooled containers are force removed by drain().
+    Containers not created by the pool are never removed, a name conflict with one raises.
+    Callers hold their docker operation limit around acquire and release.
+
+    Pooled containers run the command of their own image. Services are long-running images
+    whose entrypoint is the workload itself (nginx, databases, ...), so the pool does not park
+    containers on `tail -f /dev/null` and exec the workload into them: the image command is
+    not known to the service config, and exec'd processes are not PID 1, which breaks health
+    checks, logs and exit codes.
+
+    Idle containers are stored by ID and bound to the docker client of the running event loop
+    on acquire, so the pool can be shared by every event loop of the process.
+    """
+
+    def __init__(self, docker_factory: Callable[[], aiodocker.Docker]):
+        """Initialize the pool
+
+        Args:
+            docker_factory: getter of the async docker client used to create and start containers
+        """
+        self._docker_factory = docker_factory
+        # idle container IDs, only touched from event loop code between awaits so no lock is needed
+        self._idle: dict[str, deque[str]] = {}
+        self._all_ids: set[str] = set()
+
+    @staticmethod
+    def _pool_key(name: str, config: dict[str, Any]) -> str:
+        """Get the pool key of a container"""
+        return f"{name}:{orjson.dumps(config, option=orjson.OPT_SORT_KEYS).decode()}"
+
+    async def acquire(self, name: str, config: dict[str, Any]) -> DockerContainer:
+        """Get a started container for the name and config, reuse an idle one if possible
+
+        Args:
+            name: container name
+            config: container create config
+
+        Returns:
+            DockerContainer: the started container
+        """
+        docker = self._docker_factory()
+        idle = self._idle.get(self._pool_key(name, config))
+        if idle:
+            container = docker.containers.container(idle.popleft())
+            try:
+                await container.start()
+                logger.debug(f"Reuse pooled container {name}, id: {container.id}")
+                return container
+            except DockerError as e:
+                logger.warning(f"Pooled container {name} is not reusable, recreate it: {e}")
+                self._all_ids.discard(container.id)
+        try:
+            container = await docker.containers.create(config, name=name)
+        except DockerError as e:
+            if e.status != 409:
+                raise
+            # the name is taken, only a container of the pool is replaced, e.g. one kept idle for another config
+            existing = await docker.containers.get(name)
+            if existing.id not in self._all_ids:
+                raise
+            self._forget(existing.id)
+            await existing.delete(force=True)
+            container = await docker.containers.create(config, name=name)
+        await container.start()
+        self._all_ids.add(container.id)
+        return container
+
+    def _forget(self, cid: str) -> None:
+        """Drop a container from the pool"""
+        self._all_ids.discard(cid)
+        for idle in self._idle.values():
+            if cid in idle:
+                idle.remove(cid)
+
+    async def release(self, name: str, config: dict[str, Any], container: DockerContainer) -> None:
+        """Stop a container and return it to the pool for reuse
+
+        Args:
+            name: container name
+            config: container create config used on acquire
+            container: the container to release
+        """
+        try:
+            await container.stop()
+        except DockerError as e:
+            # removed behind the pool's back, nothing left to reuse
+            logger.warning(f"Pooled container {name} is not reusable, drop it: {e}")
+            self._all_ids.discard(container.id)
+            return
+        self._idle.setdefault(self._pool_key(name, config), deque()).append(container.id)
+
+    def drain(self) -> None:
+        """Force remove all pooled containers, registered once to run at interpreter exit"""
+        if not self._all_ids:
+            return
+
+        async def _remove_all() -> None:
+            docker = aiodocker.Docker()
+            try:
+                await asyncio.gather(
+                    *(docker.containers.container(cid).delete(force=True) for cid in self._all_ids),
+                    return_exceptions=True,
+                )
+            finally:
+                await docker.close()
+
+        try:
+            asyncio.run(_remove_all())
+        except Exception:
+            logger.exception("Failed to drain container pool")
+        self._all_ids.clear()
+        self._idle.clear()
@@ -1,13 +1,204 @@
+import asyncio
 import atexit
+import functools
+import os
+import re
+import shlex
 import uuid
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Sequence
 from enum import Enum
+from typing import Any, TypeVar
 
-from docker import DockerClient
-from docker.errors import DockerException
+import aiodocker
+import orjson
+from aiodocker.containers import DockerContainer
+from aiodocker.exceptions import DockerError
 from loguru import logger
-from pydantic import Field, field_validator
 
+from octopus.core import _docker_http
 from octopus.core.container import Container
+from octopus.core.container_pool import ContainerPool
+
+T = TypeVar("T")
+
+# docker daemon serializes concurrent container operations, cap in-flight requests below the knee
+MAX_CONCURRENT_DOCKER_OPS = int(os.getenv("MAX_CONCURRENT_DOCKER_OPS", "3"))
+RECONCILIATION_BATCH_SIZE = int(os.getenv("RECONCILIATION_BATCH_SIZE", "10"))
+
+# docker-run style container args
+_ENV_RE = re.compile(r"^-e\s+\w+=.*$")
+_PORT_RE = re.compile(r"^-p\s+\d+:\d+$")
+_VOL_RE = re.compile(r"^-v\s+[^:]+:[^:]+(:(ro|rw))?$")
+
+# docker-run flags translated into the container create config, short and legacy forms map to the long one
+_RUN_ARG_ALIASES = {
+    "-d": "--detach",
+    "-m": "--memory",
+    "-e": "--env",
+    "-p": "--publish",
+    "-v": "--volume",
+    "--net": "--network",
+}
+_RUN_ARG_SWITCHES = frozenset({"--detach", "--privileged"})
+_RUN_ARG_OPTIONS = frozenset(
+    {"--name", "--memory", "--ulimit", "--device", "--env", "--publish", "--volume", "--network"}
+)
+_MEMORY_RE = re.compile(r"^(\d+(?:\.\d+)?)([bkmgtp]?)b?$", re.I)
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40, "p": 1 << 50}
+
+
+def _parse_memory(value: str) -> int:
+    """Convert a docker memory size like '512m' into bytes"""
+    match = _MEMORY_RE.match(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid memory size: {value}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).lower()])
+
+
+def _parse_ulimit(value: str) -> dict[str, Any]:
+    """Convert a docker ulimit like 'nofile=1024:2048' into a create config ulimit"""
+    name, sep, limits = value.partition("=")
+    soft, _, hard = limits.partition(":")
+    try:
+        if not name or not sep:
+            raise ValueError
+        return {"Name": name, "Soft": int(soft), "Hard": int(hard or soft)}
+    except ValueError:
+        raise ValueError(f"Invalid ulimit, expect NAME=SOFT[:HARD]: {value}") from None
+
+
+def _parse_device(value: str) -> dict[str, str]:
+    """Convert a docker device like '/dev/sda:/dev/xvda:rwm' into a create config device mapping"""
+    host, _, rest = value.partition(":")
+    cntr, _, perms = rest.partition(":")
+    return {"PathOnHost": host, "PathInContainer": cntr or host, "CgroupPermissions": perms or "rwm"}
+
+
+def _run_arg_tokens(run_args: Iterable[str]) -> Iterator[tuple[str, str | None]]:
+    """Split docker-run style args into (flag, value) pairs, flags and values may be separate args or one arg"""
+    tokens = [token for arg in run_args for token in shlex.split(arg)]
+    i = 0
+    while i < len(tokens):
+        flag, eq, value = tokens[i].partition("=")
+        flag = _RUN_ARG_ALIASES.get(flag, flag)
+        i += 1
+        if flag in _RUN_ARG_SWITCHES and not eq:
+            yield flag, None
+        elif flag in _RUN_ARG_OPTIONS:
+            if not eq:
+                if i == len(tokens):
+                    raise ValueError(f"Run argument {flag} requires a value")
+                value = tokens[i]
+                i += 1
+            yield flag, value
+        else:
+            raise ValueError(f"Unsupported run argument: {tokens[i - 1]}")
+
+
+# HostConfig key, value converter and whether the flag is repeatable, per host config run arg
+_HOST_CONFIG_ARGS: dict[str, tuple[str, Callable[[str | None], Any], bool]] = {
+    "--privileged": ("Privileged", lambda _: True, False),
+    "--memory": ("Memory", _parse_memory, False),
+    "--ulimit": ("Ulimits", _parse_ulimit, True),
+    "--device": ("Devices", _parse_device, True),
+    "--network": ("NetworkMode", str, False),
+}
+
+
+# aiodocker client per event loop, its connection pool is bound to the loop that created it
+_docker_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiodocker.Docker]" = weakref.WeakKeyDictionary()
+
+
+def get_docker() -> aiodocker.Docker:
+    """Get the aiodocker client of the running event loop, constructed on first use instead of at import"""
+    loop = asyncio.get_running_loop()
+    docker = _docker_clients.get(loop)
+    if docker is None:
+        docker = _docker_clients[loop] = aiodocker.Docker()
+    return docker
+
+
+async def close_docker() -> None:
+    """Close the docker clients of the running event loop"""
+    docker = _docker_clients.pop(asyncio.get_running_loop(), None)
+    if docker is not None:
+        await docker.close()
+    await _docker_http.close()
+
+
+def _close_dockers() -> None:
+    """Close the docker clients left open on interpreter exit"""
+    for docker in list(_docker_clients.values()):
+        try:
+            asyncio.run(docker.close())
+        except Exception:
+            logger.exception("Failed to close docker client")
+    _docker_clients.clear()
+
+
+atexit.register(_close_dockers)
+
+# docker operation limiter per event loop, an asyncio.Semaphore is bound to the loop that first waits on it
+_docker_sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _docker_sem() -> asyncio.Semaphore:
+    """Get the semaphore capping in-flight docker operations of the running event loop"""
+    loop = asyncio.get_running_loop()
+    sem = _docker_sems.get(loop)
+    if sem is None:
+        sem = _docker_sems[loop] = asyncio.Semaphore(MAX_CONCURRENT_DOCKER_OPS)
+    return sem
+
+
+@functools.cache
+def get_container_pool() -> ContainerPool:
+    """Get the warm container pool of the process, its containers are drained once at interpreter exit"""
+    pool = ContainerPool(get_docker)
+    atexit.register(pool.drain)
+    return pool
+
+
+# services whose container must be force removed at exit, pooled containers are drained by their pool
+_atexit_registry: set["Service"] = set()
+
+
+def _cleanup_all() -> None:
+    """Force remove the containers of all unremoved services in a single event loop at interpreter exit"""
+    services = [svc for svc in _atexit_registry if svc.container_id is not None]
+    if not services:
+        return
+
+    async def _remove_all() -> None:
+        # the shared client may already be closed by its own exit hook
+        docker = aiodocker.Docker()
+        try:
+            results = await asyncio.gather(*(svc._cleanup(docker) for svc in services), return_exceptions=True)
+        finally:
+            await docker.close()
+        for svc, res in zip(services, results, strict=True):
+            if isinstance(res, Exception):
+                logger.error(f"Failed to remove container {svc.container_id}: {res}")
+
+    try:
+        asyncio.run(_remove_all())
+    except Exception:
+        logger.exception("Failed to clean up containers")
+    _atexit_registry.clear()
+
+
+atexit.register(_cleanup_all)
+
+
+async def gather_in_batches(aws: Iterable[Awaitable[T]], batch_size: int = RECONCILIATION_BATCH_SIZE) -> list[T]:
+    """Await docker operations batch by batch, log progress between batches"""
+    aws = list(aws)
+    results: list[T] = []
+    for i in range(0, len(aws), batch_size):
+        results.extend(await asyncio.gather(*aws[i : i + batch_size]))
+        logger.info(f"Docker operations progress: {len(results)}/{len(aws)}")
+    return results
 
 
 class ServiceStatus(Enum):
@@ -25,49 +216,120 @@ class ServiceStatus(Enum):
 class Service(Container):
     """Service in Container"""
 
-    envs: list[str] = Field(default_factory=list, description="Environment variables")
-    ports: list[str] = Field(default_factory=list, description="Ports")
-    volumes: list[str] = Field(default_factory=list, description="Volumes")
-    run_args: list[str] = Field(default_factory=list, description="Run arguments")
+    # fixed attribute layout, keeps per-instance memory small for pipelines with many services
+    __slots__ = (
+        "envs",
+        "ports",
+        "volumes",
+        "run_args",
+        "container_name",
+        "_pool",
+        "_container",
+        "_config",
+        "_create_body",
+        "__uuid",
+        "__status",
+        "__weakref__",
+    )
+
+    envs: tuple[str, ...]
+    ports: tuple[str, ...]
+    volumes: tuple[str, ...]
+    run_args: tuple[str, ...]
 
-    _registered_containers: set[str] = set()
-    __uuid: str
-    __docker_client: DockerClient = DockerClient.from_env()
-    __status: ServiceStatus = ServiceStatus.NOT_STARTED
+    # live services only, entries vanish with their instance so no shared id set needs locking
+    _registered_containers: "weakref.WeakSet[Service]" = weakref.WeakSet()
 
     def __init__(
         self,
         name: str,
         image: str,
-        envs: list[str] | None,
-        ports: list[str] | None,
-        volumes: list[str] | None,
-        run_args: list[str] | None,
+        envs: Sequence[str] | None,
+        ports: Sequence[str] | None,
+        volumes: Sequence[str] | None,
+        run_args: Sequence[str] | None,
+        pool: ContainerPool | None = None,
     ):
         super().__init__(name, image)
+        self._pool = pool
+        # cached container handle, saves a daemon round-trip per operation
+        self._container: DockerContainer | None = None
         self.__uuid = str(uuid.uuid4())
-        self.run_args = [
-            "-d",
-            "--name",
-            self.name,
-        ]
-        if envs:
-            self.envs = envs
-        if ports:
-            self.ports = ports
-        if volumes:
-            self.volumes = volumes
-        if run_args:
-            self.run_args.extend(run_args)
+        self.envs = self.validate_envs(envs or ())
+        self.ports = self.validate_ports(ports or ())
+        self.volumes = self.validate_volumes(volumes or ())
+        self.run_args = ("-d", "--name", self.name, *self.validate_run_args(run_args or ()))
+        # envs/ports/volumes/run args are fixed after construction, build and encode the create config once
+        self.container_name, self._config = self._build_config()
+        self._create_body = orjson.dumps(self._config)
         self.__status = ServiceStatus.NOT_STARTED
 
-    def _cleanup(self) -> None:
-        """Internal cleanup method that will be called on exit"""
-        if self.container_id is not None:
-            try:
-                self.remove()
-            except DockerException:
-                logger.error(f"Failed to remove container {self.container_id}")
+    async def _cleanup(self, docker: aiodocker.Docker) -> None:
+        """Kill and remove the container with its anonymous volumes in one daemon call, used on exit"""
+        await docker.containers.container(self.container_id).delete(force=True, v=True)
+
+    def _build_config(self) -> tuple[str, dict[str, Any]]:
+        """Translate docker-run style envs/ports/volumes/run args into the container name and create config
+
+        Raises:
+            ValueError: If a run arg can not be translated
+        """
+        name = self.name
+        envs = [env.removeprefix("-e").strip() for env in self.envs]
+        ports = [port.removeprefix("-p").strip() for port in self.ports]
+        binds = [vol.removeprefix("-v").strip() for vol in self.volumes]
+        collected = {"--env": envs, "--publish": ports, "--volume": binds}
+        host_config: dict[str, Any] = {}
+        for flag, value in _run_arg_tokens(self.run_args):
+            if flag == "--name":
+                # the last '--name' wins like docker cli
+                name = value
+            elif flag in collected:
+                collected[flag].append(value)
+            elif flag in _HOST_CONFIG_ARGS:
+                key, convert, repeated = _HOST_CONFIG_ARGS[flag]
+                if repeated:
+                    host_config.setdefault(key, []).append(convert(value))
+                else:
+                    host_config[key] = convert(value)
+
+        port_bindings: dict[str, list[dict[str, str]]] = {}
+        for port in ports:
+            host_port, sep, cntr_port = port.rpartition(":")
+            if not sep:
+                raise ValueError(f"Ports must be in the format of 'HOST:CONTAINER', got {port}")
+            port_bindings[f"{cntr_port}/tcp"] = [{"HostPort": host_port}]
+        return name, {
+            "Image": self.image,
+            "Env": envs,
+            "ExposedPorts": {port: {} for port in port_bindings},
+            "HostConfig": {"PortBindings": port_bindings, "Binds": binds, **host_config},
+        }
+
+    def _bound_container(self) -> DockerContainer | None:
+        """Get the cached container handle, rebound to the docker client of the running event loop"""
+        container = self._container
+        if container is not None and container.docker is not get_docker():
+            container = self._container = get_docker().containers.container(container.id)
+        return container
+
+    async def _refresh(self) -> dict[str, Any] | None:
+        """Reload container state from docker daemon, drop the cached handle if container was removed"""
+        container = self._bound_container()
+        if container is None:
+            return None
+        try:
+            return await container.show()
+        except DockerError as e:
+            if e.status == 404:
+                self._container = None
+                return None
+            raise
+
+    @classmethod
+    def registered_containers(cls) -> list[str]:
+        """Get the container IDs of all running services"""
+        return [svc.container_id for svc in list(cls._registered_containers) if svc.container_id is not None]
 
     @property
     def uuid(self) -> str:
@@ -79,128 +341,153 @@ class Service(Container):
         """Get the service status"""
         return self.__status
 
-    @field_validator("envs")
     @classmethod
-    def validate_envs(cls, v: list[str]) -> list[str]:
+    def validate_envs(cls, v: Sequence[str]) -> tuple[str, ...]:
         """Validate the environment variables"""
-        if not isinstance(v, list):
+        if type(v) not in (list, tuple):
             raise ValueError("Environment variables must be a list")
-        for env in v:
-            if "-e" not in env:
-                raise ValueError("Environment variables must be in the format of -e KEY=VALUE")
-        return v
+        if not all(_ENV_RE.match(env) for env in v):
+            raise ValueError("Environment variables must be in the format of -e KEY=VALUE")
+        return tuple(v)
 
-    @field_validator("ports")
     @classmethod
-    def validate_ports(cls, v: list[str]) -> list[str]:
+    def validate_ports(cls, v: Sequence[str]) -> tuple[str, ...]:
         """Validate the ports"""
-        if not isinstance(v, list):
+        if type(v) not in (list, tuple):
             raise ValueError("Ports must be a list")
-        for port in v:
-            if ":" not in port or "-v" not in port:
-                raise ValueError("Ports must be in the format of '-p HOST:CONTAINER'")
-        return v
+        if not all(_PORT_RE.match(port) for port in v):
+            raise ValueError("Ports must be in the format of '-p HOST:CONTAINER'")
+        return tuple(v)
 
-    @field_validator("volumes")
     @classmethod
-    def validate_volumes(cls, v: list[str]) -> list[str]:
+    def validate_volumes(cls, v: Sequence[str]) -> tuple[str, ...]:
         """Validate the volumes"""
-        if not isinstance(v, list):
+        if type(v) not in (list, tuple):
             raise ValueError("Volumes must be a list")
-        for volume in v:
-            if "-v" not in volume or ":" not in volume:
-                raise ValueError("Volumes must be in the format of '-v HOST:CONTAINER'")
-        return v
+        if not all(_VOL_RE.match(volume) for volume in v):
+            raise ValueError("Volumes must be in the format of '-v HOST:CONTAINER'")
+        return tuple(v)
 
-    @field_validator("run_args")
     @classmethod
-    def validate_run_args(cls, v: list[str]) -> list[str]:
+    def validate_run_args(cls, v: Sequence[str]) -> tuple[str, ...]:
         """Validate the run arguments"""
-        if not isinstance(v, list):
+        if type(v) not in (list, tuple):
             raise ValueError("Run arguments must be a list")
-        return v
+        return tuple(v)
 
-    def run(self) -> str:
+    async def run(self) -> str:
         """Run the service in container, return the container ID"""
         try:
-            if self.container_id is None and self.__docker_client.containers.get(self.container_id) is None:
-                res = self.__docker_client.containers.run(
-                    self.image,
-                    self.envs,
-                    self.ports,
-                    self.volumes,
-                    self.run_args,
-                )
-                if res.status_code == 200:
-                    self.container_id = res.id
-                    self.container_name = res.name
-                    self.__status = ServiceStatus.RUNNING
-                    self._registered_containers.add(self.container_id)
-                    atexit.register(self._cleanup)
-                else:
-                    raise DockerException(f"Failed to start container {self.container_id}")
-            elif self.container_id and self.__docker_client.containers.get(self.container_id) is None:
+            if self.container_id is None:
+                async with _docker_sem():
+                    if self._pool is not None:
+                        container = await self._pool.acquire(self.container_name, self._config)
+                    else:
+                        # hot path talks to the daemon socket directly, skipping aiodocker's model wrapping
+                        cid = await _docker_http.create(self.container_name, self._create_body)
+                        await _docker_http.start(cid)
+                        container = get_docker().containers.container(cid)
+                self._container = container
+                self.container_id = container.id
+                self.__status = ServiceStatus.RUNNING
+                self._registered_containers.add(self)
+                # pooled containers are removed by the pool at exit
+                if self._pool is None:
+                    _atexit_registry.add(self)
+            elif await self._refresh() is None:
                 logger.warning(f"Container {self.name} was removed unexpected, rerun it")
+                self._registered_containers.discard(self)
                 self.container_id = None
                 self.__status = ServiceStatus.NOT_STARTED
-                return self.run()
+                _atexit_registry.discard(self)
+                return await self.run()
             else:
                 logger.warning(f"Container {self.name} is already running, id: {self.container_id}")
                 self.__status = ServiceStatus.RUNNING
             return self.container_id
-        except DockerException as e:
+        except DockerError as e:
             logger.error(f"Failed to run container: {str(e)}")
             self.__status = ServiceStatus.EXITED
             raise
 
-    def start(self) -> None:
+    async def start(self) -> None:
         """Start the service"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            self.__docker_client.containers.start(self.container_id)
+        container = self._bound_container()
+        if container is not None:
+            await container.start()
             self.__status = ServiceStatus.RUNNING
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """Stop the service"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
+        container = self._bound_container()
+        if container is not None:
             try:
-                self.__docker_client.containers.stop(self.container_id)
+                async with _docker_sem():
+                    await container.stop()
                 self.__status = ServiceStatus.STOPPED
-            except DockerException as e:
+            except DockerError as e:
                 logger.error(f"Failed to stop container: {str(e)}")
                 raise
 
-    def pause(self) -> None:
+    async def pause(self) -> None:
         """Pause the service"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            self.__docker_client.containers.pause(self.container_id)
+        container = self._bound_container()
+        if container is not None:
+            await container.pause()
             self.__status = ServiceStatus.PAUSED
 
-    def remove(self) -> None:
-        """Remove the service"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            self.__docker_client.containers.remove(self.container_id)
+    async def remove(self) -> None:
+        """Remove the service, pooled container is stopped and released back to the pool for reuse"""
+        container = self._bound_container()
+        if container is not None:
+            async with _docker_sem():
+                if self._pool is not None:
+                    await self._pool.release(self.container_name, self._config, container)
+                else:
+                    await container.delete(force=True)
             self.__status = ServiceStatus.REMOVED
-            self._registered_containers.remove(self.container_id)
+            self._registered_containers.discard(self)
+            self._container = None
             self.container_id = None
-            atexit.unregister(self._cleanup)
+            _atexit_registry.discard(self)
+
+    async def wait(self) -> int:
+        """Wait for the service to exit, return its exit code"""
+        if self.container_id is None:
+            raise RuntimeError(f"Service {self.name} is not running")
+        exit_code = await _docker_http.wait(self.container_id)
+        self.__status = ServiceStatus.EXITED
+        return exit_code
 
-    def get_logs(self) -> list[str]:
-        """Get servic log"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            return self.__docker_client.containers.get(self.container_id).logs()
-        return []
+    async def get_logs(self, tail: int = 1000) -> list[str]:
+        """Get the last `tail` lines of service log, truncated by the daemon instead of downloading the whole history"""
+        container = self._bound_container()
+        if container is None:
+            return []
+        return await container.log(stdout=True, stderr=True, tail=tail)
 
-    def is_healthy(self) -> bool:
+    async def tail_logs(self, tail: int = 0) -> AsyncIterator[str]:
+        """Stream service log as it is written, starting with the last `tail` lines"""
+        container = self._bound_container()
+        if container is None:
+            return
+        async for line in container.log(stdout=True, stderr=True, follow=True, tail=tail):
+            yield line
+
+    async def is_healthy(self) -> bool:
         """Check if the service is healthy"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            try:
-                return self.__docker_client.containers.get(self.container_id).health()
-            except DockerException:
-                return False
-        return False
+        try:
+            info = await self._refresh()
+        except DockerError:
+            return False
+        if info is None:
+            return False
+        state = info.get("State", {})
+        # fall back to running state if no healthcheck defined in image
+        if "Health" in state:
+            return state["Health"].get("Status") == "healthy"
+        return state.get("Running", False)
 
-    def get_container_info(self) -> dict[str, str]:
+    async def get_container_info(self) -> dict[str, Any]:
         """Get container information by docker inspect"""
-        if self.container_id and self.__docker_client.containers.get(self.container_id):
-            return self.__docker_client.containers.get(self.container_id).inspect()
-        return {}
+        return await self._refresh() or {}
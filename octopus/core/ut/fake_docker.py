@@ -0,0 +1,135 @@
+"""In-process fake of the Docker Engine API served on a UNIX socket, for tests of the docker clients."""
+
+import asyncio
+import itertools
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from octopus.core import _docker_http, service
+
+_VERSION_PREFIX_RE = re.compile(r"^/v[0-9.]+")
+
+
+class FakeDocker:
+    """Fake docker daemon keeping containers in memory.
+
+    Serves the container endpoints used by aiodocker and the raw socket client, with or
+    without the API version prefix. Both clients are pointed to the fake socket while the
+    context is entered. `async with` serves from the running event loop, `with` serves from
+    a background thread for code running its own event loops.
+    """
+
+    def __init__(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Initialize the fake daemon.
+
+        Args:
+            tmp_path: Directory of the UNIX socket
+            monkeypatch: Patches the socket path of the docker clients
+        """
+        self.socket = str(tmp_path / "docker.sock")
+        self.monkeypatch = monkeypatch
+        self.containers: dict[str, dict[str, Any]] = {}
+        # (method, path) of every request, without the API version prefix
+        self.requests: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # seconds each container create takes, lets tests observe concurrency
+        self.create_delay = 0.0
+        self._ids = itertools.count(1)
+        self._runner: web.AppRunner | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def _find(self, ref: str) -> dict[str, Any] | None:
+        """Find a container by ID or name."""
+        if ref in self.containers:
+            return self.containers[ref]
+        return next((c for c in self.containers.values() if c["Name"] == f"/{ref}"), None)
+
+    async def _create(self, request: web.Request) -> web.Response:
+        """Create a container."""
+        name = request.query.get("name", "")
+        if self._find(name) is not None:
+            return web.json_response({"message": f"Conflict. The container name /{name} is already in use"}, status=409)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.create_delay)
+        finally:
+            self.in_flight -= 1
+        cid = f"cid{next(self._ids)}"
+        config = await request.json()
+        self.containers[cid] = {"Id": cid, "Name": f"/{name}", "Config": config, "State": {"Running": False}}
+        return web.json_response({"Id": cid}, status=201)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Dispatch a request to the fake endpoints."""
+        path = _VERSION_PREFIX_RE.sub("", request.path)
+        self.requests.append((request.method, path))
+        if path == "/version":
+            return web.json_response({"ApiVersion": "1.43", "Version": "24.0.0"})
+        if request.method == "POST" and path == "/containers/create":
+            return await self._create(request)
+
+        match = re.fullmatch(r"/containers/([^/]+)(/[a-z]+)?", path)
+        container = self._find(match.group(1)) if match else None
+        if container is None:
+            return web.json_response({"message": "No such container"}, status=404)
+        action = (request.method, match.group(2))
+        if action == ("GET", "/json"):
+            return web.json_response(container)
+        if action in (("POST", "/start"), ("POST", "/stop")):
+            container["State"]["Running"] = action[1] == "/start"
+            return web.Response(status=204)
+        if action == ("POST", "/wait"):
+            return web.json_response({"StatusCode": 0})
+        if action == ("DELETE", None):
+            del self.containers[container["Id"]]
+            return web.Response(status=204)
+        return web.json_response({"message": "page not found"}, status=404)
+
+    def running(self) -> list[str]:
+        """Get the names of the running containers."""
+        return [c["Name"].lstrip("/") for c in self.containers.values() if c["State"]["Running"]]
+
+    async def _serve(self) -> None:
+        """Serve the fake daemon in the running event loop."""
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        # the daemon state outlives the server, it may be served again in another event loop
+        Path(self.socket).unlink(missing_ok=True)
+        await web.UnixSite(self._runner, self.socket).start()
+        self.monkeypatch.setenv("DOCKER_HOST", f"unix://{self.socket}")
+        self.monkeypatch.setattr(_docker_http, "DOCKER_SOCKET", self.socket)
+
+    async def __aenter__(self) -> "FakeDocker":
+        """Serve the fake daemon in the running event loop and point the docker clients to it."""
+        await self._serve()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the docker clients of the running event loop and stop serving."""
+        await service.close_docker()
+        await self._runner.cleanup()
+
+    def __enter__(self) -> "FakeDocker":
+        """Serve the fake daemon from a background thread, for code running its own event loops."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._serve(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop serving and the background thread."""
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,130 @@
+"""Unit tests for ContainerPool class."""
+
+import asyncio
+from collections import deque
+
+import pytest
+from aiodocker.exceptions import DockerError
+
+from octopus.core.container_pool import ContainerPool
+from octopus.core.service import Service, get_container_pool, get_docker
+from octopus.core.ut.fake_docker import FakeDocker
+
+CONFIG = {"Image": "nginx:latest", "Env": [], "ExposedPorts": {}, "HostConfig": {}}
+
+
+def test_pool_reuses_released_container(tmp_path, monkeypatch):
+    """Test a released container is stopped, then restarted by the next acquire instead of created again."""
+    pool = ContainerPool(get_docker)
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            first = await pool.acquire("svc", CONFIG)
+            assert daemon.running() == ["svc"]
+            await pool.release("svc", CONFIG, first)
+            assert daemon.running() == []
+            assert list(daemon.containers) == [first.id]
+
+            second = await pool.acquire("svc", CONFIG)
+            assert second.id == first.id
+            assert daemon.running() == ["svc"]
+            assert daemon.requests.count(("POST", "/containers/create")) == 1
+
+    asyncio.run(_run())
+
+
+def test_pool_recreates_unusable_container(tmp_path, monkeypatch):
+    """Test an idle container removed behind the pool's back is replaced by a new one."""
+    pool = ContainerPool(get_docker)
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            first = await pool.acquire("svc", CONFIG)
+            await pool.release("svc", CONFIG, first)
+            daemon.containers.clear()
+
+            second = await pool.acquire("svc", CONFIG)
+            assert second.id != first.id
+            assert daemon.running() == ["svc"]
+
+    asyncio.run(_run())
+
+
+def test_pool_shared_across_event_loops(tmp_path, monkeypatch):
+    """Test containers released in one event loop are reused from another one."""
+    pool = ContainerPool(get_docker)
+    daemon = FakeDocker(tmp_path, monkeypatch)
+
+    async def _release() -> str:
+        async with daemon:
+            container = await pool.acquire("svc", CONFIG)
+            await pool.release("svc", CONFIG, container)
+            return container.id
+
+    async def _reacquire() -> str:
+        async with daemon:
+            return (await pool.acquire("svc", CONFIG)).id
+
+    cid = asyncio.run(_release())
+    assert asyncio.run(_reacquire()) == cid
+    assert daemon.running() == ["svc"]
+
+
+def test_pool_drops_container_removed_before_release(tmp_path, monkeypatch):
+    """Test a container removed behind the pool's back is not kept for reuse."""
+    pool = ContainerPool(get_docker)
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            first = await pool.acquire("svc", CONFIG)
+            daemon.containers.clear()
+            await pool.release("svc", CONFIG, first)
+
+            second = await pool.acquire("svc", CONFIG)
+            assert second.id != first.id
+            assert daemon.requests.count(("POST", f"/containers/{second.id}/start")) == 1
+
+    asyncio.run(_run())
+    assert pool._idle == {}
+
+
+def test_pool_name_conflict(tmp_path, monkeypatch):
+    """Test a container of another config kept by the pool is replaced, one of another owner is never removed."""
+    pool = ContainerPool(get_docker)
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            first = await pool.acquire("svc", CONFIG)
+            await pool.release("svc", CONFIG, first)
+            second = await pool.acquire("svc", {**CONFIG, "Env": ["A=1"]})
+            assert list(daemon.containers) == [second.id]
+
+            daemon.containers["foreign"] = {"Id": "foreign", "Name": "/other", "Config": {}, "State": {"Running": True}}
+            with pytest.raises(DockerError) as exc_info:
+                await pool.acquire("other", CONFIG)
+            assert exc_info.value.status == 409
+            assert daemon.running() == ["svc", "other"]
+
+    asyncio.run(_run())
+    assert pool._idle == {pool._pool_key("svc", CONFIG): deque()}
+
+
+def test_service_remove_stops_pooled_container(tmp_path, monkeypatch):
+    """Test removing a pooled service stops its container instead of leaving it running."""
+    pool = ContainerPool(get_docker)
+    service = Service(name="svc", image="nginx:latest", envs=None, ports=None, volumes=None, run_args=None, pool=pool)
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            cid = await service.run()
+            await service.remove()
+            assert daemon.running() == []
+            assert list(daemon.containers) == [cid]
+            assert service.container_id is None
+
+    asyncio.run(_run())
+
+
+def test_get_container_pool_is_process_wide():
+    """Test every caller shares one pool."""
+    assert get_container_pool() is get_container_pool()
@@ -0,0 +1,131 @@
+"""Unit tests for Service class."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiodocker.exceptions import DockerError
+
+from octopus.core.service import MAX_CONCURRENT_DOCKER_OPS, Service, ServiceStatus, gather_in_batches
+from octopus.core.ut.fake_docker import FakeDocker
+from octopus.dsl.dsl_config import DslConfig
+
+
+@pytest.fixture
+def sample_config() -> DslConfig:
+    """Fixture for the sample DSL config."""
+    return DslConfig.from_yaml_file(Path(__file__).parents[2] / "dsl" / "test_data" / "config_sample_v0.1.0.yaml")
+
+
+def _service(run_args: list[str]) -> Service:
+    """Create a service without envs, ports and volumes."""
+    return Service(name="svc", image="nginx:latest", envs=None, ports=None, volumes=None, run_args=run_args)
+
+
+def test_build_config_sample_service(sample_config):
+    """Test the create config of service_simple carries every run arg of the sample config."""
+    dsl_service = next(svc for svc in sample_config.services if svc.name == "service_simple")
+    service = Service(
+        name=dsl_service.name,
+        image=dsl_service.image,
+        envs=[f"-e {env}" for env in dsl_service.envs],
+        ports=[f"-p {port}" for port in dsl_service.ports],
+        volumes=[f"-v {vol}" for vol in dsl_service.vols],
+        run_args=dsl_service.args,
+    )
+
+    assert service.container_name == "service_simple"
+    assert service._config == {
+        "Image": "nginx:latest",
+        "Env": ["DEBUG_LOG=debug"],
+        "ExposedPorts": {"80/tcp": {}},
+        "HostConfig": {
+            "PortBindings": {"80/tcp": [{"HostPort": "80"}]},
+            "Binds": ["~/data:/data"],
+            "Ulimits": [{"Name": "nofile", "Soft": 1024, "Hard": 1024}],
+            "Devices": [{"PathOnHost": "all", "PathInContainer": "all", "CgroupPermissions": "rwm"}],
+            "Privileged": True,
+            "Memory": 512 * 1024 * 1024,
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "run_args",
+    [
+        ["--name custom"],
+        ["--name", "custom"],
+        ["--name=custom"],
+        ["--name other", "--name custom"],
+    ],
+)
+def test_build_config_container_name(run_args):
+    """Test '--name' is taken as one arg, as flag and value args, or in '=' form, the last one wins."""
+    assert _service(run_args=run_args).container_name == "custom"
+
+
+def test_build_config_run_arg_forms():
+    """Test short and long flag forms are translated alike."""
+    service = _service(
+        run_args=["-e A=1", "--env=B=2", "-p 8080:80", "-v /tmp:/tmp:ro", "--memory 1g", "--network host", "-d"]
+    )
+    assert service._config["Env"] == ["A=1", "B=2"]
+    assert service._config["ExposedPorts"] == {"80/tcp": {}}
+    assert service._config["HostConfig"] == {
+        "PortBindings": {"80/tcp": [{"HostPort": "8080"}]},
+        "Binds": ["/tmp:/tmp:ro"],
+        "Memory": 1 << 30,
+        "NetworkMode": "host",
+    }
+
+
+@pytest.mark.parametrize(
+    ("run_args", "match"),
+    [
+        (["--rm"], "Unsupported run argument: --rm"),
+        (["--cpus 2"], "Unsupported run argument: --cpus"),
+        (["-m"], "requires a value"),
+        (["-m lots"], "Invalid memory size"),
+        (["--ulimit nofile"], "Invalid ulimit"),
+    ],
+)
+def test_build_config_rejects_untranslatable_args(run_args, match):
+    """Test run args the create config can not express are rejected instead of dropped."""
+    with pytest.raises(ValueError, match=match):
+        _service(run_args=run_args)
+
+
+def test_run_caps_concurrent_docker_ops_per_event_loop(tmp_path, monkeypatch):
+    """Test concurrent service runs stay under the cap, in every event loop of the process."""
+    daemon = FakeDocker(tmp_path, monkeypatch)
+    daemon.create_delay = 0.01
+
+    async def _run_all(prefix: str) -> None:
+        async with daemon:
+            services = [_service([f"--name {prefix}{i}"]) for i in range(MAX_CONCURRENT_DOCKER_OPS * 2)]
+            await gather_in_batches(svc.run() for svc in services)
+            await gather_in_batches(svc.remove() for svc in services)
+
+    asyncio.run(_run_all("first"))
+    asyncio.run(_run_all("second"))
+    assert daemon.max_in_flight == MAX_CONCURRENT_DOCKER_OPS
+    assert daemon.containers == {}
+
+
+def test_run_does_not_replace_foreign_container(tmp_path, monkeypatch):
+    """Test a name conflict with a container of another owner fails the run and leaves the container alone."""
+    service = _service([])
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            daemon.containers["foreign"] = {"Id": "foreign", "Name": "/svc", "Config": {}, "State": {"Running": True}}
+            with pytest.raises(DockerError) as exc_info:
+                await service.run()
+            assert (exc_info.value.status, str(exc_info.value)) == (
+                409,
+                "[409] Conflict. The container name /svc is already in use",
+            )
+            assert list(daemon.containers) == ["foreign"]
+
+    asyncio.run(_run())
+    assert service.status == ServiceStatus.EXITED
@@ -2,6 +2,6 @@
 DSL module for test configuration and parsing
 """
 
-from . import dsl_config, dsl_validator, parser, variable
+from . import dsl_config, variable
 
-__all__ = ["dsl_config", "parser", "dsl_validator", "variable"]
+__all__ = ["dsl_config", "variable"]
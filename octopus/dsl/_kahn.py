@@ -0,0 +1,79 @@
+"""
+Kahn's topological sort kernel over CSR arrays, JIT compiled by numba when it is installed
+"""
+
+from array import array
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+
+def _kahn_kernel(indptr, indices, edge_types, allowed, in_degrees, active, order) -> int:
+    # in_degrees, active and order are zeroed buffers of n entries, order is filled with the sorted node ids
+    n = len(indptr) - 1
+    for u in range(n):
+        for k in range(indptr[u], indptr[u + 1]):
+            if allowed[edge_types[k]]:
+                v = indices[k]
+                in_degrees[v] += 1
+                active[u] = 1
+                active[v] = 1
+
+    # order doubles as the FIFO queue, every node is enqueued at most once
+    tail = 0
+    for u in range(n):
+        if active[u] and in_degrees[u] == 0:
+            order[tail] = u
+            tail += 1
+    head = 0
+    while head < tail:
+        u = order[head]
+        head += 1
+        for k in range(indptr[u], indptr[u + 1]):
+            if allowed[edge_types[k]]:
+                v = indices[k]
+                in_degrees[v] -= 1
+                if in_degrees[v] == 0:
+                    order[tail] = v
+                    tail += 1
+    return tail
+
+
+if numba is not None:
+    _kahn_kernel = numba.njit(cache=True)(_kahn_kernel)
+
+
+def kahn_csr(indptr: array, indices: array, edge_types: array, allowed: bytearray) -> tuple[list[int], int]:
+    """Topologically sort the nodes with at least one edge of the allowed types.
+
+    Args:
+        indptr: CSR row offsets, n + 1 entries
+        indices: CSR successor node ids
+        edge_types: Edge type code per successor
+        allowed: Flag per edge type code, non-zero if edges of the type are part of the subgraph
+
+    Returns:
+        The sorted node ids, and the number of nodes in the subgraph. Fewer sorted nodes than
+        subgraph nodes means the subgraph has a cycle.
+    """
+    n = len(indptr) - 1
+    in_degrees = array("i", [0]) * n
+    active = bytearray(n)
+    order = array("i", [0]) * n
+    if numba is not None:
+        # zero-copy numpy views of the buffers for the compiled kernel
+        count = _kahn_kernel(
+            np.frombuffer(indptr, dtype=np.int32),
+            np.frombuffer(indices, dtype=np.int32),
+            np.frombuffer(edge_types, dtype=np.int8),
+            np.frombuffer(allowed, dtype=np.uint8),
+            np.frombuffer(in_degrees, dtype=np.int32),
+            np.frombuffer(active, dtype=np.uint8),
+            np.frombuffer(order, dtype=np.int32),
+        )
+    else:
+        count = _kahn_kernel(indptr, indices, edge_types, allowed, in_degrees, active, order)
+    return order[:count].tolist(), sum(active)
@@ -2,13 +2,13 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from octopus.dsl.constants import TEST_EXPECT_FIELDS, TestMode
+from octopus.dsl.constants import EXPECT_FIELD_BITS, TEST_EXPECT_FIELDS, TEST_EXPECT_MASKS, TestMode
 
 
 class Expect(BaseModel):
     """Test expectations configuration."""
 
-    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+    model_config = ConfigDict(extra="forbid")
 
     mode: TestMode = Field(default=TestMode.NONE, description="Test mode")
     exit_code: int | str | None = Field(default=None, description="Exit code")
@@ -26,18 +26,27 @@ class Expect(BaseModel):
         """
         super().__init__(**data)
         #        self.mode = mode
-        self._validate_fields()
+        # bits of the fields given a value, validation keeps None and non-None values as they are
+        present = 0
+        for field, value in data.items():
+            if value is not None:
+                present |= EXPECT_FIELD_BITS.get(field, 0)
+        self._validate_fields(present)
+
+    def _validate_fields(self, present: int):
+        """Validate that all required fields are present.
 
-    def _validate_fields(self):
-        """Validate that all required fields are present."""
-        required = TEST_EXPECT_FIELDS[self.mode]
-        missing = [field for field in required if getattr(self, field) is None]
-        if missing:
+        Args:
+            present: Bits of the fields with a value, see EXPECT_FIELD_BITS
+        """
+        required = TEST_EXPECT_MASKS[self.mode]
+        if present & required != required:
+            missing = [field for field in TEST_EXPECT_FIELDS[self.mode] if getattr(self, field) is None]
             raise ValueError(f"Missing required fields for {self.mode}: {missing}")
 
     def to_dict(self) -> dict[str, str]:
         """Convert the expect instance to a dictionary."""
-        return {k: v for k, v in self.model_dump().items() if v is not None}
+        return self.model_dump(exclude_none=True)
 
     def __repr__(self) -> str:
         """Return the string representation of the expect instance."""
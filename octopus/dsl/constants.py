@@ -2,7 +2,6 @@
 Constants used in the DSL configuration.
 """
 
-import inspect
 from enum import Enum
 
 
@@ -87,29 +86,18 @@ class Keywords:
     KW_STATUS_CODE = "status_code"
     KW_RESPONSE = "response"
 
+    # All keywords above, collected once at class creation
+    VALID_KEYWORDS = frozenset(v for k, v in locals().items() if k.startswith("KW_"))
+
     @classmethod
     def is_support_version(cls, version: str) -> bool:
         """Check if the version is valid."""
-        return version in SUPPORTED_VERSION
+        return version in _SUPPORTED_VERSIONS
 
     @classmethod
     def is_valid_keyword(cls, key: str) -> bool:
         """Check if the keyword is valid."""
-
-        def _get_kw_collection(cls):
-            return [
-                v
-                for k, v in cls.__dict__.items()
-                if not (
-                    k.startswith("_")
-                    or inspect.ismethod(v)
-                    or inspect.isfunction(v)
-                    or isinstance(v, classmethod)
-                    or k in ["model_config", "model_fields"]
-                )
-            ]
-
-        return key in _get_kw_collection(cls)
+        return key in cls.VALID_KEYWORDS
 
 
 # Required fields for each test mode
@@ -121,6 +109,9 @@ TEST_RUNNER_FIELDS = {
     TestMode.DOCKER: ["cmd"],
 }
 
+# Required runner fields of each mode as sets, checked with one subset test against the present fields
+TEST_RUNNER_FIELD_SETS = {mode: frozenset(fields) for mode, fields in TEST_RUNNER_FIELDS.items()}
+
 # Expected fields for each test mode
 TEST_EXPECT_FIELDS = {
     TestMode.SHELL: ["exit_code", "stdout", "stderr"],
@@ -131,4 +122,13 @@ TEST_EXPECT_FIELDS = {
     #    TestMode.NONE: [],     # will fail if test mode is not specified
 }
 
+# Bit of each expect field, the required fields of a mode are checked with one AND against the present fields
+EXPECT_FIELD_BITS = {
+    field: 1 << i for i, field in enumerate(dict.fromkeys(f for fields in TEST_EXPECT_FIELDS.values() for f in fields))
+}
+TEST_EXPECT_MASKS = {
+    mode: sum(EXPECT_FIELD_BITS[field] for field in fields) for mode, fields in TEST_EXPECT_FIELDS.items()
+}
+
 SUPPORTED_VERSION = ["0.1.0"]
+_SUPPORTED_VERSIONS = frozenset(SUPPORTED_VERSION)
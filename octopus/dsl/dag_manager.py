@@ -1,17 +1,51 @@
-import sys
-from typing import Protocol, runtime_checkable
+import functools
+from array import array
+from collections import Counter
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 import networkx as nx
-from loguru import logger
 
-# from octopus.dsl.dsl_config import DslConfig
-from octopus.dsl.dsl_service import DslService
-from octopus.dsl.dsl_test import DslTest
+from octopus.dsl._kahn import kahn_csr
+
+if TYPE_CHECKING:
+    from loguru import Logger
+    from rich.console import Console
+    from rich.tree import Tree
+
+    # from octopus.dsl.dsl_config import DslConfig
+    from octopus.dsl.dsl_service import DslService
+    from octopus.dsl.dsl_test import DslTest
+
+
+@functools.cache
+def _get_logger() -> "Logger":
+    """Get the logger, loguru is imported on first use instead of at import"""
+    from loguru import logger
+
+    # log through the sinks configured by the application, a library call must not replace them
+    return logger
+
+
+@functools.cache
+def _get_plt() -> Any:
+    """Get matplotlib's pyplot, imported on first use"""
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+@functools.cache
+def _get_rich() -> tuple["Console", type["Tree"]]:
+    """Get the shared rich console and the Tree class, imported on first use"""
+    from rich.console import Console
+    from rich.tree import Tree
+
+    return Console(), Tree
 
-logger.remove()
-logger.add(sys.stdout, level="DEBUG")
 
 ALLOWED_EDGE_TYPES = ["next", "trigger", "depends_on", "needs"]
+_EDGE_TYPE_CODES = {t: i for i, t in enumerate(ALLOWED_EDGE_TYPES)}
 
 
 @runtime_checkable
@@ -19,12 +53,12 @@ class ConfigProtocol(Protocol):
     """Duck typing of DslConfig required by DAGManager."""
 
     @property
-    def services(self) -> list[DslService]:
+    def services(self) -> list["DslService"]:
         """Get list of services."""
         ...
 
     @property
-    def tests(self) -> list[DslTest]:
+    def tests(self) -> list["DslTest"]:
         """Get list of tests."""
         ...
 
@@ -50,7 +84,12 @@ class DAGManager:
 
     dsl_config: ConfigProtocol
     _full_graph: nx.Graph
+    _service_names: frozenset[str]
+    _test_names: frozenset[str]
     __edge_types_in_dag: list[str] = ["next", "trigger"]
+    # set form for per-edge membership tests, and its sorted tuple as the key of the per-edge-types caches
+    __edge_types_set: frozenset[str] = frozenset(__edge_types_in_dag)
+    __edge_types_key: tuple[str, ...] = tuple(sorted(__edge_types_set))
 
     def __init__(self, dsl_config: ConfigProtocol):
         """Initialize the DAGManager with a DslConfig instance.
@@ -60,6 +99,16 @@ class DAGManager:
         """
         self.dsl_config = dsl_config
         self._full_graph = nx.DiGraph()
+        # subgraph per set of allowed edge types, only changes when the graph is rebuilt
+        self._subgraph_cache: dict[tuple[str, ...], nx.DiGraph] = {}
+        # successors of each node bucketed by edge type and the root services, per allowed edge types
+        self._out_index_cache: dict[tuple[str, ...], tuple[dict[str, dict[str, list[str]]], list[str]]] = {}
+        # spring layout positions of each cached subgraph, keyed by edge types and layout seed
+        self._layout_cache: dict[tuple[tuple[str, ...], int | None], dict[str, Any]] = {}
+        # topological sort result of each cached subgraph
+        self._sort_cache: dict[tuple[str, ...], tuple[list[str], bool]] = {}
+        # node position in each cached acyclic order, kept up to date by add_edge
+        self._ord_cache: dict[tuple[str, ...], dict[str, int]] = {}
         self._build_graph()
 
     @property
@@ -69,44 +118,68 @@ class DAGManager:
     @allowed_edge_types.setter
     def allowed_edge_types(self, types: list[str]):
         for t in types:
-            if t not in ALLOWED_EDGE_TYPES:
+            if t not in _EDGE_TYPE_CODES:
                 raise ValueError(f"Invalid edge type: {t}")
         self.__edge_types_in_dag = types
+        self.__edge_types_set = frozenset(types)
+        self.__edge_types_key = tuple(sorted(self.__edge_types_set))
+        self._subgraph_cache.clear()
+        self._out_index_cache.clear()
+        self._layout_cache.clear()
+        self._sort_cache.clear()
+        self._ord_cache.clear()
+
+    @staticmethod
+    def _service_view(svc: "DslService") -> tuple[str, tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+        # plain snapshot of the service neighbors, read once instead of per edge through the model attributes,
+        # duplicated entries are dropped in order
+        return (
+            svc.name,
+            tuple(dict.fromkeys(svc.get_next())),
+            tuple(dict.fromkeys(svc.depends_on)),
+            tuple(dict.fromkeys(svc.trigger)),
+        )
 
-    def __build_service_edges(self, services: list[str]):
-        # add depends_on, trigger edges
-        for svc in services:
-            for next_svc in svc.get_next():
-                if next_svc not in self._full_graph:
-                    logger.warning(f"Service '{svc.name}' next to non-existent service '{next_svc}'")
+    @staticmethod
+    def __build_service_edges(
+        svc_view: list[tuple[str, tuple[str, ...], tuple[str, ...], tuple[str, ...]]],
+        node_names: frozenset[str],
+        test_names: frozenset[str],
+        missing_refs: list[tuple[str, str]],
+    ) -> list[tuple[str, str, dict[str, str]]]:
+        # collect next, depends_on, trigger edges, skipped references to non-existent services go to missing_refs
+        edges = []
+        for name, next_svcs, depends_on, triggers in svc_view:
+            for next_svc in next_svcs:
+                if next_svc not in node_names:
+                    missing_refs.append((name, next_svc))
                     continue
-                self._full_graph.add_edge(svc.name, next_svc, type="next")
+                edges.append((name, next_svc, {"type": "next"}))
 
-            for dep in svc.depends_on:
-                if dep not in self._full_graph:
-                    logger.warning(f"Service '{svc.name}' depends on non-existent service '{dep}'")
+            for dep in depends_on:
+                if dep not in node_names:
+                    missing_refs.append((name, dep))
                     continue
-                self._full_graph.add_edge(dep, svc.name, type="depends_on")
-
-            for test_name in svc.trigger:
-                if not self.dsl_config.is_valid_test(test_name):
-                    raise ValueError(f"Service {svc} triggers non-existent Test {test_name}")
-                if test_name not in self._full_graph:
-                    self._full_graph.add_node(test_name, type="test")
-                else:
-                    logger.info(f"Test '{test_name}' already exists in graph")
-                self._full_graph.add_edge(svc.name, test_name, type="trigger")
-
-    def __build_test_edges(self, tests: list[str]):
-        # Add test edges
-        for test in tests:
-            for svc in test.needs:
-                if not self.dsl_config.is_valid_service(svc):
-                    raise ValueError(f"Test '{test.name}' needs non-existent service '{svc}'")
-                if svc not in self._full_graph:
-                    logger.warning(f"Test '{test.name}' needs non-existent service '{svc}'")
-                    continue
-                self._full_graph.add_edge(test.name, svc, type="needs")
+                edges.append((dep, name, {"type": "depends_on"}))
+
+            for test_name in triggers:
+                if test_name not in test_names:
+                    raise ValueError(f"Service {name} triggers non-existent Test {test_name}")
+                edges.append((name, test_name, {"type": "trigger"}))
+        return edges
+
+    @staticmethod
+    def __build_test_edges(
+        test_view: list[tuple[str, tuple[str, ...]]], service_names: frozenset[str]
+    ) -> list[tuple[str, str, dict[str, str]]]:
+        # collect needs edges
+        edges = []
+        for name, needs in test_view:
+            for svc in needs:
+                if svc not in service_names:
+                    raise ValueError(f"Test '{name}' needs non-existent service '{svc}'")
+                edges.append((name, svc, {"type": "needs"}))
+        return edges
 
     def _build_graph(self):
         """Build the graph structure from DslConfig data.
@@ -120,47 +193,303 @@ class DAGManager:
         services = self.dsl_config.services
         tests = self.dsl_config.tests
 
-        # Add all service nodes
-        for svc in services:
-            self._full_graph.add_node(svc.name, type="service")
+        # snapshot names and neighbors once, the edge builders then only touch plain tuples
+        self._svc_view = [self._service_view(svc) for svc in services]
+        self._test_view = [(test.name, tuple(dict.fromkeys(test.needs))) for test in tests]
+
+        # Add all service and test nodes
+        self._full_graph.add_nodes_from((view[0], {"type": "service"}) for view in self._svc_view)
+        self._full_graph.add_nodes_from((view[0], {"type": "test"}) for view in self._test_view)
 
-        # Add all test nodes
-        for test in tests:
-            self._full_graph.add_node(test.name, type="test")
+        # name lookups per edge, instead of re-verifying the whole config through is_valid_service/test
+        self._service_names = frozenset(view[0] for view in self._svc_view)
+        self._test_names = frozenset(view[0] for view in self._test_view)
+        node_names = self._service_names | self._test_names
 
-        self.__build_service_edges(services)
-        self.__build_test_edges(tests)
+        # edges are collected in the original order, a later edge between the same nodes overrides its type
+        self._missing_refs: list[tuple[str, str]] = []
+        self._full_graph.add_edges_from(
+            self.__build_service_edges(self._svc_view, node_names, self._test_names, self._missing_refs)
+        )
+        if self._missing_refs:
+            # one summary instead of a formatted warning per skipped reference
+            _get_logger().warning(
+                "Skip {} references to non-existent services: {}", len(self._missing_refs), self._missing_refs
+            )
+        self._full_graph.add_edges_from(self.__build_test_edges(self._test_view, self._service_names))
+        self._build_csr()
+        self._subgraph_cache.clear()
+        self._out_index_cache.clear()
+        self._layout_cache.clear()
+        self._sort_cache.clear()
+        self._ord_cache.clear()
+
+    def _build_csr(self):
+        """Materialize the full graph as compressed sparse row arrays for traversals.
+
+        Successors of node id i are _csr_indices[_csr_indptr[i]:_csr_indptr[i + 1]], with the
+        edge type codes in _csr_edge_types. Node ids follow the graph's node order.
+        """
+        self._id_to_name: list[str] = list(self._full_graph.nodes)
+        self._name_to_id: dict[str, int] = {name: i for i, name in enumerate(self._id_to_name)}
+        # node kind per id, 1 for services
+        self._csr_is_service = bytearray(name in self._service_names for name in self._id_to_name)
+        self._csr_indptr = array("i", [0])
+        self._csr_indices = array("i")
+        self._csr_edge_types = array("b")
+        for name in self._id_to_name:
+            for succ, attrs in self._full_graph.adj[name].items():
+                self._csr_indices.append(self._name_to_id[succ])
+                self._csr_edge_types.append(_EDGE_TYPE_CODES[attrs["type"]])
+            self._csr_indptr.append(len(self._csr_indices))
+        self._csr_stale = False
 
     def _gen_subgraph(self) -> nx.DiGraph:
         """
-        Generate a subgraph with only the allowed edge types.``
+        Generate a subgraph with only the allowed edge types.
+
+        The subgraph is cached until the allowed edge types change or the graph is rebuilt,
+        callers must not modify it.
         """
-        subgraph = nx.DiGraph()
-        for u, v, attrs in self._full_graph.edges(data=True):
-            if attrs.get("type") in self.allowed_edge_types:
-                subgraph.add_edge(u, v, **attrs)
-                subgraph.add_node(u, **self._full_graph.nodes[u])
-                subgraph.add_node(v, **self._full_graph.nodes[v])
+        key = self.__edge_types_key
+        subgraph = self._subgraph_cache.get(key)
+        if subgraph is None:
+            allowed = self.__edge_types_set
+            edges = [(u, v) for u, v, t in self._full_graph.edges(data="type") if t in allowed]
+            # copy the view once, cached lookups then skip the view's per-access edge filtering
+            subgraph = self._full_graph.edge_subgraph(edges).copy()
+            self._subgraph_cache[key] = subgraph
         return subgraph
 
+    def _plan_index(self) -> tuple[dict[str, dict[str, list[str]]], list[str]]:
+        """Get the successors of each node of the subgraph bucketed by edge type, and the root services.
+
+        Built from the CSR arrays without materializing the subgraph, cached per allowed edge types.
+
+        Returns:
+            Mapping of node to edge type to successors in the subgraph's node and adjacency order,
+            and the service nodes without incoming edges in graph order
+        """
+        key = self.__edge_types_key
+        result = self._out_index_cache.get(key)
+        if result is None:
+            if self._csr_stale:
+                self._build_csr()
+            allowed = {_EDGE_TYPE_CODES[t]: t for t in key}
+            indptr, indices, types, names = self._csr_indptr, self._csr_indices, self._csr_edge_types, self._id_to_name
+            n = len(names)
+            out: dict[int, dict[str, list[str]]] = {}
+            active = bytearray(n)
+            has_in_edge = bytearray(n)
+            for u in range(n):
+                for k in range(indptr[u], indptr[u + 1]):
+                    edge_type = allowed.get(types[k])
+                    if edge_type is not None:
+                        v = indices[k]
+                        out.setdefault(u, {}).setdefault(edge_type, []).append(names[v])
+                        active[u] = active[v] = has_in_edge[v] = 1
+            # same nodes as the subgraph in graph order, nodes without out edges get empty buckets
+            index = {names[u]: out.get(u, {}) for u in range(n) if active[u]}
+            is_service = self._csr_is_service
+            roots = [names[u] for u in range(n) if active[u] and is_service[u] and not has_in_edge[u]]
+            result = self._out_index_cache[key] = (index, roots)
+        return result
+
+    def _kahn_sort(self, edge_types: list[str]) -> tuple[list[str], bool]:
+        """Topologically sort the subgraph of the given edge types and detect cycles in one pass (Kahn's algorithm).
+
+        Runs on the CSR arrays, only nodes with at least one edge of the given types are sorted,
+        same as the nodes of the subgraph.
+
+        Args:
+            edge_types: Edge types forming the subgraph
+
+        Returns:
+            The sorted nodes, and whether all nodes were sorted, i.e. the subgraph has no cycle
+        """
+        if self._csr_stale:
+            self._build_csr()
+        allowed = bytearray(len(_EDGE_TYPE_CODES))
+        for t in edge_types:
+            allowed[_EDGE_TYPE_CODES[t]] = 1
+        order, n_active = kahn_csr(self._csr_indptr, self._csr_indices, self._csr_edge_types, allowed)
+        return [self._id_to_name[u] for u in order], len(order) == n_active
+
+    def _sort_subgraph(self) -> tuple[list[str], bool]:
+        """Topologically sort the subgraph of allowed edge types, cached with the subgraph.
+
+        Returns:
+            A copy of the sorted nodes, and whether the subgraph has no cycle
+        """
+        key = self.__edge_types_key
+        result = self._sort_cache.get(key)
+        if result is None:
+            result = self._sort_cache[key] = self._kahn_sort(self.allowed_edge_types)
+            if result[1]:
+                self._ord_cache[key] = {node: i for i, node in enumerate(result[0])}
+        return list(result[0]), result[1]
+
+    def add_service(self, svc: "DslService"):
+        """Add a service node and its edges to the graph, cached orders are updated incrementally.
+
+        Only the graph is updated, the service is not added to the config.
+
+        Args:
+            svc: The service to add
+
+        Raises:
+            ValueError: If the service already exists or triggers a non-existent test
+        """
+        if svc.name in self._full_graph:
+            raise ValueError(f"Node '{svc.name}' already exists")
+        service_names = self._service_names | {svc.name}
+        missing_refs: list[tuple[str, str]] = []
+        view = self._service_view(svc)
+        # collect the edges first, a trigger of a non-existent test raises before the graph is changed
+        edges = self.__build_service_edges([view], service_names | self._test_names, self._test_names, missing_refs)
+        self._full_graph.add_node(svc.name, type="service")
+        self._service_names = service_names
+        self._csr_stale = True
+        self._svc_view.append(view)
+        for u, v, attrs in edges:
+            self.add_edge(u, v, attrs["type"])
+        if missing_refs:
+            _get_logger().warning("Skip {} references to non-existent services: {}", len(missing_refs), missing_refs)
+        self._missing_refs.extend(missing_refs)
+
+    def add_edge(self, u: str, v: str, edge_type: str):
+        """Add an edge between existing nodes, cached orders are updated incrementally.
+
+        Cached topological orders containing the edge type are repaired with the Pearce-Kelly
+        algorithm, which only reorders the nodes between v and u in the current order instead of
+        sorting the whole graph again.
+
+        Args:
+            u: Source node
+            v: Target node
+            edge_type: Edge type, one of ALLOWED_EDGE_TYPES
+
+        Raises:
+            ValueError: If the edge type is invalid or a node does not exist
+        """
+        if edge_type not in _EDGE_TYPE_CODES:
+            raise ValueError(f"Invalid edge type: {edge_type}")
+        for node in (u, v):
+            if node not in self._full_graph:
+                raise ValueError(f"Node '{node}' does not exist")
+
+        replaced = self._full_graph.has_edge(u, v)
+        self._full_graph.add_edge(u, v, type=edge_type)
+        self._csr_stale = True
+        self._subgraph_cache.clear()
+        self._out_index_cache.clear()
+        self._layout_cache.clear()
+        if replaced:
+            # the type of an existing edge changed, the node sets of the subgraphs may change as well
+            self._sort_cache.clear()
+            self._ord_cache.clear()
+            return
+
+        for key, (order, ok) in self._sort_cache.items():
+            if edge_type in key and ok:
+                self._sort_cache[key] = (order, self._pearce_kelly(key, order, u, v))
+
+    def _pearce_kelly(self, key: tuple[str, ...], order: list[str], u: str, v: str) -> bool:
+        """Repair a topological order in place after edge u -> v was added.
+
+        Args:
+            key: Edge types of the order
+            order: The topological order to repair
+            u: Source node of the new edge
+            v: Target node of the new edge
+
+        Returns:
+            Whether the order is still acyclic
+        """
+        ord_ = self._ord_cache[key]
+        # nodes joining the subgraph go last, u first so the new edge points forward
+        for node in (u, v):
+            if node not in ord_:
+                ord_[node] = len(order)
+                order.append(node)
+        lower, upper = ord_[v], ord_[u]
+        if lower > upper:
+            return True
+
+        allowed = set(key)
+        # nodes reachable from v which are placed before u, reaching u itself closes a cycle
+        delta_f = self._pk_search(v, allowed, lambda node: ord_[node] < upper, self._full_graph.adj, u)
+        if delta_f is None:
+            del self._ord_cache[key]
+            return False
+        # nodes reaching u which are placed after v
+        delta_b = self._pk_search(u, allowed, lambda node: ord_[node] > lower, self._full_graph.pred)
+
+        # reuse the slots of the affected nodes, ancestors of u go before descendants of v
+        delta_b.sort(key=ord_.__getitem__)
+        delta_f.sort(key=ord_.__getitem__)
+        moved = delta_b + delta_f
+        for slot, node in zip(sorted(ord_[node] for node in moved), moved, strict=True):
+            ord_[node] = slot
+            order[slot] = node
+        return True
+
+    @staticmethod
+    def _pk_search(
+        start: str,
+        allowed: set[str],
+        in_window: Callable[[str], bool],
+        neighbors: Any,
+        target: str | None = None,
+    ) -> list[str] | None:
+        """Depth-first search of the nodes in the affected window of a Pearce-Kelly update.
+
+        Args:
+            start: Node to start from
+            allowed: Edge types to follow
+            in_window: Whether a node is inside the affected window
+            neighbors: Adjacency to follow, the graph's adj for successors or pred for predecessors
+            target: Node whose discovery means a cycle
+
+        Returns:
+            The visited nodes, None if target was reached
+        """
+        visited, stack, seen = [], [start], {start}
+        while stack:
+            node = stack.pop()
+            visited.append(node)
+            for other, attrs in neighbors[node].items():
+                if attrs["type"] not in allowed:
+                    continue
+                if other == target:
+                    return None
+                if other not in seen and in_window(other):
+                    seen.add(other)
+                    stack.append(other)
+        return visited
+
     def is_valid_dag(self) -> bool:
         """Check if the subgraph formed by specific edge types is a valid DAG.
         Returns:
             bool: True if the filtered subgraph is a valid DAG
         """
+        # Empty graph is technically a DAG, and so is a graph of only the allowed edge types with no cycle
+        ok = self._sort_subgraph()[1]
+        if not ok:
+            # the cycle is only searched for if a sink accepts debug records
+            _get_logger().opt(lazy=True).debug("DAG cycle found: {}", self._find_cycle)
+        return ok
 
-        # Build a subgraph with only the allowed edge types
-        subgraph = self._gen_subgraph()
-
-        # Empty graph is technically a DAG
-        if len(subgraph.edges) == 0:
-            return True
+    def _find_cycle(self) -> list[tuple[str, str]]:
+        """Get the edges of one cycle in the subgraph, for diagnostics.
 
+        Returns:
+            List of (u, v) edges forming a cycle, empty if there is none
+        """
         try:
-            return nx.is_directed_acyclic_graph(subgraph)
-        except Exception as e:
-            logger.exception(f"DAG check failed: {e}")
-            return False
+            return [(u, v) for u, v, _ in nx.find_cycle(self._gen_subgraph(), orientation="original")]
+        except nx.NetworkXNoCycle:
+            return []
 
     def get_topological_order(self) -> list[str]:
         """Get the topological order of nodes in the graph.
@@ -171,9 +500,10 @@ class DAGManager:
         Raises:
             ValueError: If the graph contains cycles
         """
-        if not self.is_valid_dag():
-            raise ValueError("Cannot perform topological sort on a graph with cycles.")
-        return list(nx.topological_sort(self._gen_subgraph()))
+        order, ok = self._sort_subgraph()
+        if not ok:
+            raise ValueError(f"Cannot perform topological sort on a graph with cycles. Cycle: {self._find_cycle()}")
+        return order
 
     def generate_execution_plan(self) -> list[str]:
         """Generate execution plan based on dependencies.
@@ -193,97 +523,92 @@ class DAGManager:
             ValueError: If the graph is not a valid DAG
         """
         if not self.is_valid_dag():
-            raise ValueError("Cannot generate execution plan for a graph with cycles")
+            raise ValueError(f"Cannot generate execution plan for a graph with cycles. Cycle: {self._find_cycle()}")
 
-        graph = self._gen_subgraph()
+        # successor buckets and root service nodes (service nodes with in_degree == 0)
+        out_by_type, root_services = self._plan_index()
         execution_plan = []
         visited = set()
 
-        # Find root service nodes (service nodes with in_degree == 0)
-        root_services = [
-            node for node in graph.nodes() if graph.nodes[node].get("type") == "service" and graph.in_degree(node) == 0
-        ]
-
         # Process each root service and its chain
         for root in root_services:
-            self._process_service_node(graph, root, execution_plan, visited)
+            self._process_service_node(out_by_type, root, execution_plan, visited)
 
         return execution_plan
 
-    def _process_service_node(self, graph, service_node, execution_plan, visited):
+    def _process_service_node(self, out_by_type, service_node, execution_plan, visited):
         """Process a service node and its triggered tests.
 
         Args:
-            graph: The graph structure
+            out_by_type: Successors of each node bucketed by edge type
             service_node: The service node to process
             execution_plan: The execution plan being built
             visited: Set of visited nodes
         """
-        if service_node in visited:
-            return
-
-        # Add service to execution plan
-        visited.add(service_node)
-        execution_plan.append(service_node)
-
-        # Process triggered tests
-        triggered_tests = self._get_triggered_tests(graph, service_node, visited)
-        for test in triggered_tests:
-            visited.add(test)
-            execution_plan.append(test)
-
-        # Process next service
-        next_service = self._get_next_service(graph, service_node, visited)
-        if next_service:
-            self._process_service_node(graph, next_service, execution_plan, visited)
-
-    def _get_triggered_tests(self, graph, service_node, visited):
+        # follow the next chain in a loop, a long chain must not hit the recursion limit
+        while service_node and service_node not in visited:
+            # Add service to execution plan
+            visited.add(service_node)
+            execution_plan.append(service_node)
+
+            # Process triggered tests
+            triggered_tests = self._get_triggered_tests(out_by_type, service_node, visited)
+            for test in triggered_tests:
+                visited.add(test)
+                execution_plan.append(test)
+
+            # Process next service
+            service_node = self._get_next_service(out_by_type, service_node, visited)
+
+    def _get_triggered_tests(self, out_by_type, service_node, visited):
         """Get all test nodes triggered by a service node.
 
         Args:
-            graph: The graph structure
+            out_by_type: Successors of each node bucketed by edge type
             service_node: The service node to check
             visited: Set of visited nodes
 
         Returns:
             List of test nodes triggered by the service
         """
-        triggered_tests = []
-        for _, test_node in graph.out_edges(service_node):
-            if graph.edges[service_node, test_node].get("type") == "trigger" and test_node not in visited:
-                triggered_tests.append(test_node)
-        return triggered_tests
+        return [test_node for test_node in out_by_type[service_node].get("trigger", ()) if test_node not in visited]
 
-    def _get_next_service(self, graph, service_node, visited):
+    def _get_next_service(self, out_by_type, service_node, visited):
         """Get the next service node through 'next' edge.
 
         Args:
-            graph: The graph structure
+            out_by_type: Successors of each node bucketed by edge type
             service_node: The current service node
             visited: Set of visited nodes
 
         Returns:
             The next service node, or None if not found
         """
-        for _, next_node in graph.out_edges(service_node):
-            if graph.edges[service_node, next_node].get("type") == "next" and next_node not in visited:
+        for next_node in out_by_type[service_node].get("next", ()):
+            if next_node not in visited:
                 return next_node
         return None
 
-    def visualize_with_plt(self, output_file: str | None = None):
+    def visualize_with_plt(self, output_file: str | None = None, seed: int | None = None):
         """Visualize test execution DAG with matplotlib
 
         Args:
             output_file: Optional path to save the visualization. If not provided, displays the graph.
+            seed: Optional random seed of the spring layout, for a deterministic layout
         """
-        import matplotlib.pyplot as plt
+        plt = _get_plt()
 
         graph = self._gen_subgraph()
 
-        if not nx.is_directed_acyclic_graph(graph):
+        # cached with the subgraph, free if the caller checked is_valid_dag already
+        if not self.is_valid_dag():
             raise ValueError("Graph is not a DAG")
 
-        pos = nx.spring_layout(graph, k=1, iterations=50)
+        # the layout only changes with the subgraph, reuse it across visualizations
+        layout_key = (self.__edge_types_key, seed)
+        pos = self._layout_cache.get(layout_key)
+        if pos is None:
+            pos = self._layout_cache[layout_key] = nx.spring_layout(graph, k=1, iterations=50, seed=seed)
 
         plt.figure(figsize=(12, 8))
         #        ax = plt.gca()
@@ -322,9 +647,12 @@ class DAGManager:
             graph, pos, nodelist=test_nodes, node_color=node_colors["test"], node_size=1000, alpha=0.8, label="Tests"
         )
 
-        # draw edges by attribute "type"
+        # draw edges by attribute "type", bucketed in a single pass over the edges
+        edges_by_type: dict[str, list[tuple[str, str]]] = {}
+        for u, v, edge_type in graph.edges(data="type"):
+            edges_by_type.setdefault(edge_type, []).append((u, v))
         for edge_type in self.allowed_edge_types:
-            edges = [(u, v) for u, v, d in graph.edges(data=True) if d.get("type") == edge_type]
+            edges = edges_by_type.get(edge_type)
             if edges:
                 nx.draw_networkx_edges(
                     graph,
@@ -354,69 +682,76 @@ class DAGManager:
 
         plt.close()
 
+    @staticmethod
+    def _build_rich_tree(graph: nx.DiGraph, root: str, tree: Any):
+        """Build rich tree with iterative depth-first travel
+
+        Nodes on the current path are tracked in one set updated on push/pop, a node
+        reached again through another parent is listed without expanding its subtree twice.
+
+        Args:
+            graph: The graph to travel
+            root: root node
+            tree: root rich tree
+        """
+        on_path: set[str] = set()
+        done: set[str] = set()
+        # (node, parent tree), parent None marks all successors of node are emitted
+        stack: list[tuple[str, Any]] = [(root, tree)]
+        while stack:
+            node, parent = stack.pop()
+            if parent is None:
+                on_path.discard(node)
+                done.add(node)
+                continue
+
+            node_tree = parent.add(f"{graph.nodes[node].get('type', 'unknown')}: {node}")
+            if node in done:
+                continue
+            on_path.add(node)
+            stack.append((node, None))
+
+            # push successors reversed, so they are popped in graph order
+            for succ in reversed(list(graph.successors(node))):
+                # check circlous dependencies
+                if succ in on_path:
+                    node_tree.add(f"[red]{graph.nodes[succ].get('type', 'unknown')}: {succ} (cycle)[/red]")
+                    continue
+                stack.append((succ, node_tree))
+
     def visualize_with_rich(self):
         """Visualize test execution DAG with rich tree structure.
 
         The tree structure shows the dependencies between services and tests.
         Each node is displayed as <node_type>:<node_name>.
         """
-        from rich.console import Console
-        from rich.tree import Tree
+        console, tree_cls = _get_rich()
 
         graph = self._gen_subgraph()
-        if not nx.is_directed_acyclic_graph(graph):
+        # cached with the subgraph, free if the caller checked is_valid_dag already
+        if not self.is_valid_dag():
             raise ValueError("Graph is not a DAG")
 
         # get root nodes
         root_nodes = [n for n in graph.nodes() if graph.in_degree(n) == 0]
 
-        console = Console()
         console.print(">>> Test Executio Plan <<<")
 
-        def build_tree(node: str, tree: Tree, visited: set[str]):
-            """build rich tree with node recursive travel
-
-            Args:
-                node: current node
-                tree: current tree
-                visited: visited node collection
-            """
-            if node in visited:
-                return
-
-            visited.add(node)
-            node_type = graph.nodes[node].get("type", "unknown")
-            node_tree = tree.add(f"{node_type}: {node}")
-
-            # get nodes after current nodes
-            successors = list(graph.successors(node))
-            for _, succ in enumerate(successors):
-                # check circlous dependencies
-                if succ in visited:
-                    node_tree.add(f"[red]{graph.nodes[succ].get('type', 'unknown')}: {succ} (cycle)[/red]")
-                    continue
-
-                # build tree recursively
-                build_tree(succ, node_tree, visited.copy())
-
         # build tree for every root node
         for root in root_nodes:
-            tree = Tree(f"{graph.nodes[root].get('type', 'unknown')}: {root}")
-            build_tree(root, tree, set())
+            tree = tree_cls(f"{graph.nodes[root].get('type', 'unknown')}: {root}")
+            self._build_rich_tree(graph, root, tree)
             console.print(tree)
 
         # print DAG
         console.print("\n[bold]Graph Statistics:[/bold]")
         console.print(f"Total nodes: {len(graph.nodes)}")
         console.print(f"Total edges: {len(graph.edges)}")
-        console.print(f"Service nodes: {len([n for n, d in graph.nodes(data=True) if d.get('type') == 'service'])}")
-        console.print(f"Test nodes: {len([n for n, d in graph.nodes(data=True) if d.get('type') == 'test'])}")
+        console.print(f"Service nodes: {len(self._service_names & graph.nodes)}")
+        console.print(f"Test nodes: {len(self._test_names & graph.nodes)}")
 
         # print statistic
-        edge_types = {}
-        for _, _, data in graph.edges(data=True):
-            edge_type = data.get("type", "unknown")
-            edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
+        edge_types = Counter(edge_type for _, _, edge_type in graph.edges(data="type", default="unknown"))
 
         console.print("\n[bold]Edge Types:[/bold]")
         for edge_type, count in edge_types.items():
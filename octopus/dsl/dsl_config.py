@@ -4,12 +4,15 @@ This module defines the data models for parsing and validating test configuratio
 """
 
 import json
+import re
+import sys
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
 import yaml
 from loguru import logger
-from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationInfo, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, ValidationInfo, field_validator
 
 from octopus.dsl.constants import SUPPORTED_VERSION, Keywords
 from octopus.dsl.dag_manager import DAGManager
@@ -17,6 +20,26 @@ from octopus.dsl.dsl_service import DslService
 from octopus.dsl.dsl_test import DslTest
 from octopus.dsl.variable import Variable
 
+# libyaml C loader when available, several times faster than the pure python one
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _InterningYamlLoader(_YamlLoader):
+    """YAML safe loader interning string scalars, a name referenced across next/trigger/needs shares one object"""
+
+
+_InterningYamlLoader.add_constructor(
+    "tag:yaml.org,2002:str", lambda loader, node: sys.intern(loader.construct_scalar(node))
+)
+
+# unindented "version:" line, for the version check before the full parse
+_VERSION_HEADER_RE = re.compile(rb"^version:[ \t]*[\"']?([0-9.]+)(?=[\"' \t\r\n#])", re.M)
+# end of iteration marker of the syntax check walk
+_END = object()
+# list validators built once, a whole list is validated in one pydantic-core call instead of one call per item
+_SERVICE_LIST_ADAPTER = TypeAdapter(list[DslService])
+_TEST_LIST_ADAPTER = TypeAdapter(list[DslTest])
+
 
 class DslConfig(BaseModel):
     """Top-level dsl configuration structure.
@@ -25,7 +48,7 @@ class DslConfig(BaseModel):
     It includes version information, basic metadata, and collections of services and tests.
     """
 
-    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+    model_config = ConfigDict(extra="forbid")
 
     version: str = Field(description="DSL version number")
     name: str = Field(description="Configuration name")
@@ -37,9 +60,14 @@ class DslConfig(BaseModel):
     # Private fields for internal use
     _services_dict: dict[str, DslService] = PrivateAttr(default_factory=dict)
     _tests_dict: dict[str, DslTest] = PrivateAttr(default_factory=dict)
-    _dag_manger: DAGManager = PrivateAttr(default=None)
+    # built on first use by the _dag_manger property
+    _dag: DAGManager | None = PrivateAttr(default=None)
     _inputs_dict: dict[str, Variable] = PrivateAttr(default_factory=dict)
     _lazy_vars: dict[str, Variable] = PrivateAttr(default_factory=dict)
+    # semantic check passed for the current services and tests, reset when they change
+    _verified: bool = PrivateAttr(default=False)
+    # formatted execution plan of the current DAG
+    _plan_cache: str | None = PrivateAttr(default=None)
 
     def __init__(self, **data: Any):
         """Initialize configuration.
@@ -51,21 +79,63 @@ class DslConfig(BaseModel):
             ValueError: If duplicate service or test names are found
         """
         super().__init__(**data)
-        # Initialize inputs mapping
-        for input in self.inputs:
-            if input.key in self._inputs_dict:
-                logger.warning(f"Duplicate input key found: {input.key}")
-            self._inputs_dict[input.key] = input
-            if input.is_lazy:
-                self._lazy_vars[input.key] = input
+        # Initialize inputs mapping, a later duplicate key overrides
+        self._inputs_dict = {input.key: input for input in self.inputs}
+        if len(self._inputs_dict) != len(self.inputs):
+            for key in self._duplicates(input.key for input in self.inputs):
+                logger.warning(f"Duplicate input key found: {key}")
+        self._lazy_vars = {k: v for k, v in self._inputs_dict.items() if v.is_lazy}
 
         # evaluate with default variables
         self.evaluate({})
 
-    def _init_dag(self):
-        """Init DAG with self"""
-        self.verify()
-        self._dag_manger = DAGManager(self)
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, a reassigned field invalidates the caches derived from the fields.
+
+        The field value is validated and the new lookups are built before the assignment, a failed
+        assignment leaves the configuration unchanged.
+        """
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        # validate on a shallow copy, pydantic stores the validated value into the model it validates
+        probe = self.model_copy()
+        self.__pydantic_validator__.validate_assignment(probe, name, value)
+        value = probe.__dict__[name]
+        services = value if name == "services" else self.services
+        tests = value if name == "tests" else self.tests
+        lookups = self._lookup(services, "service"), self._lookup(tests, "test")
+        super().__setattr__(name, value)
+        self._invalidate_caches(*lookups)
+
+    def _invalidate_caches(
+        self, services_dict: dict[str, DslService] | None = None, tests_dict: dict[str, DslTest] | None = None
+    ):
+        """Reset the caches derived from the fields, the semantic check, DAG and plan are redone on next use
+
+        Args:
+            services_dict: Lookup of the current services, built from them if not given
+            tests_dict: Lookup of the current tests, built from them if not given
+
+        Raises:
+            ValueError: If duplicate service or test names are found
+        """
+        if services_dict is None:
+            services_dict = self._lookup(self.services, "service")
+        if tests_dict is None:
+            tests_dict = self._lookup(self.tests, "test")
+        self._services_dict, self._tests_dict = services_dict, tests_dict
+        self._verified = False
+        self._dag = None
+        self._plan_cache = None
+
+    @property
+    def _dag_manger(self) -> DAGManager:
+        """DAG of the configuration, built on first access"""
+        if self._dag is None:
+            self.verify()
+            self._dag = DAGManager(self)
+        return self._dag
 
     @field_validator("version")
     @classmethod
@@ -113,14 +183,14 @@ class DslConfig(BaseModel):
         Returns:
             list[dict]: List of transformed input data
         """
-        inputs = []
         if inputs_data is None:
-            return inputs
-        for item in inputs_data:
-            if isinstance(item, dict):
-                for k, v in item.items():
-                    inputs.append({"key": k, "value": str(v)})
-        return inputs
+            return []
+        return [
+            {"key": k, "value": v if type(v) is str else str(v)}
+            for item in inputs_data
+            if isinstance(item, dict)
+            for k, v in item.items()
+        ]
 
     @staticmethod
     def _transform_tests(tests_data: list) -> list[DslTest]:
@@ -135,17 +205,18 @@ class DslConfig(BaseModel):
         Raises:
             ValueError: If test name is missing
         """
-        tests = []
         if tests_data is None:
-            return tests
+            return []
+        tests = []
         for test_data in tests_data:
             if isinstance(test_data, dict):
                 if test_data.get("name", None) is None:
                     raise ValueError("Test name is required")
-                tests.append(DslTest.from_dict(test_data))
+                tests.append(DslTest.fields_from_dict(test_data))
             elif isinstance(test_data, DslTest):
                 tests.append(test_data)
-        return tests
+        # DslTest instances pass through, the revalidation of instances is off
+        return _TEST_LIST_ADAPTER.validate_python(tests)
 
     @staticmethod
     def _transform_services(services_data: list) -> list[DslService]:
@@ -160,17 +231,18 @@ class DslConfig(BaseModel):
         Raises:
             ValueError: If service name is missing
         """
-        services = []
         if services_data is None:
-            return services
+            return []
+        services = []
         for service_data in services_data:
             if isinstance(service_data, dict):
                 if service_data.get("name", None) is None:
                     raise ValueError("Service name is required")
-                services.append(DslService.from_dict(service_data))
+                services.append(service_data)
             elif isinstance(service_data, DslService):
                 services.append(service_data)
-        return services
+        # DslService instances pass through, the revalidation of instances is off
+        return _SERVICE_LIST_ADAPTER.validate_python(services)
 
     @classmethod
     def from_dict(cls, data: dict) -> "DslConfig":
@@ -199,18 +271,26 @@ class DslConfig(BaseModel):
     @classmethod
     def _syntax_check(cls, data: dict):
         """Syntax check for config yaml data"""
-        if isinstance(data, dict):
-            for key in data:
-                if key in [Keywords.KW_INPUTS]:
+        valid_keywords = Keywords.VALID_KEYWORDS
+        # depth first walk with a stack of (is_dict, iterator), keys are checked in the same order as a recursive walk
+        stack = [(False, iter((data,)))]
+        while stack:
+            is_dict, items = stack[-1]
+            item = next(items, _END)
+            if item is _END:
+                stack.pop()
+                continue
+            if is_dict:
+                key, item = item
+                # inputs are user defined key/value pairs, not walked
+                if key == Keywords.KW_INPUTS:
                     continue
-                if not Keywords.is_valid_keyword(key):
+                if key not in valid_keywords:
                     raise ValueError(f"Syntax error: invalid keyword '{key}'")
-                cls._syntax_check(data[key])
-        elif isinstance(data, list):
-            for item in data:
-                cls._syntax_check(item)
-        else:
-            return
+            if isinstance(item, dict):
+                stack.append((True, iter(item.items())))
+            elif isinstance(item, list):
+                stack.append((False, iter(item)))
 
     @classmethod
     def from_yaml_file(cls, yaml_path: Path) -> "DslConfig":
@@ -229,15 +309,21 @@ class DslConfig(BaseModel):
             FileNotFoundError: If the YAML file does not exist
             yaml.YAMLError: If the YAML file is invalid
         """
-        if not yaml_path.exists():
-            raise FileNotFoundError(f"YAML file not found: {yaml_path}")
-
-        with open(yaml_path) as f:
-            try:
-                yaml_data = yaml.load(f, Loader=yaml.FullLoader)
-            except yaml.YAMLError:
-                logger.exception("Failed to load YAML file")
-                return None
+        # one open instead of an exists() stat followed by the read
+        try:
+            raw = yaml_path.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"YAML file not found: {yaml_path}") from None
+        # a top-level version in the header is checked before paying for the full parse
+        m = _VERSION_HEADER_RE.search(raw, 0, 512)
+        if m is not None and not Keywords.is_support_version(m.group(1).decode()):
+            raise ValueError(f"Unsupported version: {m.group(1).decode()}")
+
+        try:
+            yaml_data = yaml.load(raw, Loader=_InterningYamlLoader)
+        except yaml.YAMLError:
+            logger.exception("Failed to load YAML file")
+            return None
 
         if not Keywords.is_support_version(yaml_data.get("version", None)):
             raise ValueError(f"Unsupported version: {yaml_data.get('version', None)}")
@@ -253,20 +339,17 @@ class DslConfig(BaseModel):
         """
         errors = []
 
-        # Verify next references
-        nexts_ok, nexts_err = self._verify_nexts()
-        if not nexts_ok:
-            errors.append(f"Services with invalid 'next': {nexts_err}")
-
-        # Verify dependencies
-        deps_ok, deps_err = self._verify_dependencies()
-        if not deps_ok:
-            errors.append(f"Services with invalid 'depends_on': {deps_err}")
-
-        # Verify triggers
-        trig_ok, trig_err = self._verify_triggers()
-        if not trig_ok:
-            errors.append(f"Services with invalid 'trigger': {trig_err}")
+        # Verify next, depends_on and trigger references in one pass over the services
+        missing_nexts, missing_deps, missing_triggers = self._verify_service_refs()
+        if missing_nexts:
+            logger.error(f"Missing nexts: {missing_nexts}")
+            errors.append(f"Services with invalid 'next': {missing_nexts}")
+        if missing_deps:
+            logger.error(f"Missing dependencies: {missing_deps}")
+            errors.append(f"Services with invalid 'depends_on': {missing_deps}")
+        if missing_triggers:
+            logger.error(f"Missing triggers: {missing_triggers}")
+            errors.append(f"Services with invalid 'trigger': {missing_triggers}")
 
         # Verify needs
         needs_ok, needs_err = self._verify_needs()
@@ -280,55 +363,42 @@ class DslConfig(BaseModel):
 
         return errors
 
-    def _verify_nexts(self) -> tuple[bool, list[dict[str, str]]]:
-        """Semantic check: Verify the service next of the configuration."""
-        missing_nexts: list[dict[str, str]] = []
-        for service in self.services:
-            for svc in service.get_next():
-                if svc not in self._services_dict:
-                    err_info = {"service": service.name, "next": svc, "info": f"{svc} not found"}
-                    missing_nexts.append(err_info)
-        if len(missing_nexts) > 0:
-            logger.error(f"Missing nexts: {missing_nexts}")
-            return False, missing_nexts
-        return True, []
+    @staticmethod
+    def _missing_refs(refs: list[str], names: dict[str, Any]) -> list[str]:
+        """Get the references not in names, in reference order."""
+        # one C-level set difference for the common all-valid case, the ordered list only on errors
+        missing = set(refs).difference(names)
+        if not missing:
+            return []
+        return [ref for ref in refs if ref in missing]
 
-    def _verify_dependencies(self) -> tuple[bool, list[dict[str, str]]]:
-        """Semantic check: Verify the service dependencies of the configuration."""
-        missing_deps: list[dict[str, str]] = []
-        for service in self.services:
-            if len(service.get_depends_on()) == 0:
-                continue
-            for svc in service.get_depends_on():
-                if svc not in self._services_dict:
-                    err_info = {"service": service.name, "dependency": svc, "info": f"{svc} not found"}
-                    missing_deps.append(err_info)
-        if len(missing_deps) > 0:
-            logger.error(f"Missing dependencies: {missing_deps}")
-            return False, missing_deps
-        return True, []
+    def _verify_service_refs(self) -> tuple[list[dict[str, str]], list[dict[str, str]], list[dict[str, str]]]:
+        """Semantic check: Verify the service next, dependencies and triggers of the configuration.
 
-    def _verify_triggers(self) -> tuple[bool, list[dict[str, str]]]:
-        """Semantic check: Verify the service triggers of the configuration."""
+        Returns:
+            Missing nexts, missing dependencies and missing triggers, empty if all references exist
+        """
+        services, tests, missing_refs = self._services_dict, self._tests_dict, self._missing_refs
+        missing_nexts: list[dict[str, str]] = []
+        missing_deps: list[dict[str, str]] = []
         missing_triggers: list[dict[str, str]] = []
         for service in self.services:
-            for test in service.get_trigger():
-                if test not in self._tests_dict:
-                    err_info = {"service": service.name, "trigger": test, "info": f"{test} not found"}
-                    missing_triggers.append(err_info)
-        if len(missing_triggers) > 0:
-            logger.error(f"Missing triggers: {missing_triggers}")
-            return False, missing_triggers
-        return True, []
+            for svc in missing_refs(service.get_next(), services):
+                missing_nexts.append({"service": service.name, "next": svc, "info": f"{svc} not found"})
+            for svc in missing_refs(service.get_depends_on(), services):
+                missing_deps.append({"service": service.name, "dependency": svc, "info": f"{svc} not found"})
+            for test in missing_refs(service.get_trigger(), tests):
+                missing_triggers.append({"service": service.name, "trigger": test, "info": f"{test} not found"})
+        return missing_nexts, missing_deps, missing_triggers
 
     def _verify_needs(self) -> bool:
         """Semantic check: Verify the test needs of the configuration."""
+        services, missing_refs = self._services_dict, self._missing_refs
         missing_needs: list[dict[str, str]] = []
         for test in self.tests:
-            for svc in test.get_needs():
-                if svc not in self._services_dict:
-                    err_info = {"test": test.name, "needs": svc, "info": f"{svc} not found"}
-                    missing_needs.append(err_info)
+            for svc in missing_refs(test.get_needs(), services):
+                err_info = {"test": test.name, "needs": svc, "info": f"{svc} not found"}
+                missing_needs.append(err_info)
         if len(missing_needs) > 0:
             logger.error(f"Missing needs: {missing_needs}")
             return False, missing_needs
@@ -341,12 +411,17 @@ class DslConfig(BaseModel):
     def verify(self) -> bool:
         """Verify the configuration by semantic check.
 
+        A passed check is cached until a field is reassigned or the configuration is re-evaluated.
+
         Raises:
             ValueError: If any semantic check fails, with detailed error messages
         """
+        if self._verified:
+            return True
         errors = self._collect_verification_errors()
         if errors:
             raise ValueError("semantic check failed:\n" + "\n".join(errors))
+        self._verified = True
         return True
 
     def evaluate(self, variables: dict[str, Any]) -> None:
@@ -372,35 +447,49 @@ class DslConfig(BaseModel):
         for service in self.services:
             service.evaluate(var_dict)
 
-        # refresh services, tests lut
-        self._refresh_services_dict()
-        self._refresh_tests_dict()
-        # refresh DAG
-        self._init_dag()
+        # evaluated names and references are checked again, the DAG is rebuilt on first use
+        self._invalidate_caches()
+        self.verify()
+
+    @staticmethod
+    def _duplicates(names: Iterable[str]) -> list[str]:
+        """Get the repeated names, in the order their repeats occur."""
+        seen = set()
+        duplicates = []
+        for name in names:
+            if name in seen:
+                duplicates.append(name)
+            seen.add(name)
+        return duplicates
+
+    @classmethod
+    def _lookup(cls, items: list[DslService] | list[DslTest], kind: str) -> dict[str, Any]:
+        """Map services or tests by name.
+
+        Raises:
+            ValueError: If duplicate names are found
+        """
+        lookup = {item.name: item for item in items}
+        if len(lookup) != len(items):
+            duplicate = cls._duplicates(item.name for item in items)[0]
+            raise ValueError(f"Duplicate {kind} name found: {duplicate}")
+        return lookup
 
     def _refresh_services_dict(self):
         """refresh services mapping"""
-        self._services_dict = {}
-        for service in self.services:
-            if service.name in self._services_dict:
-                raise ValueError(f"Duplicate service name found: {service.name}")
-            self._services_dict[service.name] = service
+        self._services_dict = self._lookup(self.services, "service")
 
     def _refresh_tests_dict(self):
         """refresh tests mapping"""
-        self._tests_dict = {}
-        for test in self.tests:
-            if test.name in self._tests_dict:
-                raise ValueError(f"Duplicate test name found: {test.name}")
-            self._tests_dict[test.name] = test
+        self._tests_dict = self._lookup(self.tests, "test")
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the configuration instance to a dictionary.
 
         Returns:
-            dict: The configuration instance as a dictionary
+            dict: The configuration instance as a dictionary, None values are left out at every level
         """
-        return {k: v for k, v in self.model_dump().items() if v is not None}
+        return self.model_dump(exclude_none=True)
 
     def is_valid_service(self, service_name: str) -> bool:
         """Check if the service name is valid."""
@@ -413,8 +502,10 @@ class DslConfig(BaseModel):
         return test_name in self._tests_dict
 
     def gen_execution_plan(self) -> dict[str, list[str]]:
-        """generate execution plan by DAG"""
+        """generate execution plan by DAG, cached until the DAG is rebuilt"""
         self.verify()
+        if self._plan_cache is not None:
+            return self._plan_cache
         execution_plan = self._dag_manger.generate_execution_plan()
         cmd_list = []
         for name in execution_plan:
@@ -424,7 +515,8 @@ class DslConfig(BaseModel):
                 cmd_list.append(f">>> test '{name}': {self._tests_dict[name].get_command()}")
             else:
                 raise ValueError(f"Invalid node name: {name}")
-        return "\n".join(cmd_list)
+        self._plan_cache = "\n".join(cmd_list)
+        return self._plan_cache
 
     def print_execution_dag(self):
         """generate execution DAG by DAG"""
@@ -441,15 +533,21 @@ class DslConfig(BaseModel):
         self._dag_manger.visualize_with_plt()
 
     def __repr__(self) -> str:
-        """Custom string representation."""
+        """Custom string representation, services and tests are summarized by count."""
         attrs = []
-        for field in self.model_fields:
+        for field in _REPR_FIELDS:
             value = getattr(self, field)
             if value is not None:
                 attrs.append(f"{field}={value!r}")
+        attrs.append(f"services=<{len(self.services)} services>")
+        attrs.append(f"tests=<{len(self.tests)} tests>")
         return f"DslConfig({', '.join(attrs)})"
 
 
+# fields rendered in full by DslConfig.__repr__, the nested service and test models are only counted
+_REPR_FIELDS = tuple(f for f in DslConfig.model_fields if f not in ("services", "tests"))
+
+
 if __name__ == "__main__":
     test_yaml_file = Path(__file__).parent / "test_data" / "config_sample_v0.1.0.yaml"
     config = DslConfig.from_yaml_file(test_yaml_file)
@@ -2,7 +2,6 @@
 Service configuration models.
 """
 
-import copy
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
@@ -16,7 +15,7 @@ class DslService(BaseModel):
     This model represents the configuration of a service.
     """
 
-    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+    model_config = ConfigDict(extra="forbid")
 
     name: str = Field(description="Service name")
     desc: str = Field(description="Service description")
@@ -33,6 +32,7 @@ class DslService(BaseModel):
     trigger: list[str] | None = Field(default_factory=list, description="the tests that current one triggers")
 
     __origin_data: dict[str, Any] = PrivateAttr(default_factory=dict)
+    __has_vars: bool = PrivateAttr(default=True)
 
     def __init__(self, **data):
         """Initialize service configuration.
@@ -42,7 +42,11 @@ class DslService(BaseModel):
         """
         super().__init__(**data)
         # Store original data for evaluate
-        self.__origin_data = copy.deepcopy(data)
+        self.__origin_data = VariableEvaluator.clone_collection(data)
+        # Services without any ${...} placeholder evaluate to themselves
+        self.__has_vars = any(
+            "${" in s for v in data.values() for s in (v if isinstance(v, list) else [v]) if isinstance(s, str)
+        )
 
     @classmethod
     def from_dict(cls, body: dict[str, Any]) -> "DslService":
@@ -61,25 +65,27 @@ class DslService(BaseModel):
         2. Evaluating variables in the restored data
         3. Updating the model with evaluated values
 
+        Services without any variable placeholder are left as they are.
+
         Args:
             variables: A dictionary of variables to evaluate the service with
         """
+        if not self.__has_vars:
+            return
+
         # Restore original data
-        data = copy.deepcopy(self.__origin_data)
+        data = VariableEvaluator.clone_collection(self.__origin_data)
 
         # Evaluate variables in the data
         VariableEvaluator.evaluate_dict(data, variables)
 
-        # Update model with evaluated values
+        # Update model with evaluated values, validated once as a whole instead of per assigned field
         updated_data = self.model_validate(data)
-        for k, v in updated_data.__dict__.items():
-            if k.startswith("_") or k in ["model_config", "model_fields"]:
-                continue
-            setattr(self, k, v)
+        self.__dict__.update(updated_data.__dict__)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the service instance to a dictionary."""
-        return {k: v for k, v in self.model_dump().items() if v is not None}
+        return self.model_dump(exclude_none=True)
 
     def get_depends_on(self) -> list[str]:
         """Get the dependencies of the service."""
@@ -112,9 +118,9 @@ class DslService(BaseModel):
 
     def __repr__(self) -> str:
         """Return the string representation of the service instance."""
-        attrs = []
-        for field in self.model_fields:
-            value = getattr(self, field)
-            if value is not None:
-                attrs.append(f"{field}={value!r}")
+        attrs = [f"{field}={value!r}" for field in _REPR_FIELDS if (value := getattr(self, field)) is not None]
         return f"DslService({', '.join(attrs)})"
+
+
+# fields rendered by DslService.__repr__, in declaration order
+_REPR_FIELDS = tuple(DslService.model_fields)
@@ -2,7 +2,6 @@
 Test configuration models.
 """
 
-import copy
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationInfo, field_validator, model_validator
@@ -10,6 +9,7 @@ from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationInfo,
 from octopus.dsl.checker import Expect
 from octopus.dsl.constants import TestMode
 from octopus.dsl.runner import (
+    RUNNER_TYPES,
     BaseRunner,
     DockerRunner,
     GrpcRunner,
@@ -49,15 +49,13 @@ class DslTest(BaseModel):
         # initialize other fields first
         super().__init__(**data)
 
-        # manually create expect instance, pass in mode
-        if "expect" in data and isinstance(data["expect"], dict) and not isinstance(data["expect"], Expect):
-            self.expect = Expect(**data["expect"])
+        # expect is built and validated by super().__init__ already, do not build it twice
 
         if "runner" in data and isinstance(data["runner"], dict):
             self.runner = create_runner(self.mode, data["runner"])
 
         # Store original data for evaluate
-        self.__origin_data = copy.deepcopy(data)
+        self.__origin_data = VariableEvaluator.clone_collection(data)
 
     @field_validator("mode")
     @classmethod
@@ -133,6 +131,21 @@ class DslTest(BaseModel):
         Returns:
             Test: A new Test instance
 
+        Raises:
+            ValueError: If required fields are missing or invalid
+        """
+        return cls(**cls.fields_from_dict(body))
+
+    @staticmethod
+    def fields_from_dict(body: dict[str, Any]) -> dict[str, Any]:
+        """Get the constructor fields of a Test from a dictionary, without building the instance.
+
+        Args:
+            body: Test configuration dictionary from the YAML value
+
+        Returns:
+            dict: The fields to create the Test instance with
+
         Raises:
             ValueError: If required fields are missing or invalid
         """
@@ -147,6 +160,7 @@ class DslTest(BaseModel):
         mode = body.get("mode")
         if not mode:
             raise ValueError(f"Test mode is required for test '{name}'")
+        mode = TestMode(mode)
 
         desc = body.get("desc", "")
         needs = body.get("needs", [])
@@ -162,17 +176,17 @@ class DslTest(BaseModel):
         expect_config = body.get("expect", {})
         if not isinstance(expect_config, dict):
             raise ValueError(f"Expect configuration must be a dictionary, got {type(expect_config)}")
-        expect_config.update({"mode": TestMode(mode)})
-
-        # Create and return Test instance with all fields
-        return cls(
-            name=name,
-            mode=TestMode(mode),
-            desc=desc,
-            needs=needs,
-            runner=runner_config,
-            expect=expect_config,  # Pass the dict directly, let __init__ handle it
-        )
+        expect_config.update({"mode": mode})
+
+        # All fields of the Test instance
+        return {
+            "name": name,
+            "mode": mode,
+            "desc": desc,
+            "needs": needs,
+            "runner": runner_config,
+            "expect": expect_config,  # Pass the dict directly, let __init__ handle it
+        }
 
     @field_validator("runner")
     @classmethod
@@ -197,15 +211,7 @@ class DslTest(BaseModel):
         if mode is None:
             return v
 
-        runner_types = {
-            TestMode.SHELL: ShellRunner,
-            TestMode.HTTP: HttpRunner,
-            TestMode.GRPC: GrpcRunner,
-            TestMode.PYTEST: PytestRunner,
-            TestMode.DOCKER: DockerRunner,
-        }
-
-        expected_type = runner_types[mode]
+        expected_type = RUNNER_TYPES[mode]
         if not isinstance(v, expected_type):
             raise ValueError(
                 f"Invalid runner type for mode {mode}. " f"Expected {expected_type.__name__}, got {type(v).__name__}"
@@ -225,17 +231,15 @@ class DslTest(BaseModel):
             variables: A dictionary of variables to evaluate the test with
         """
         # Restore original data
-        data = copy.deepcopy(self.__origin_data)
+        data = VariableEvaluator.clone_collection(self.__origin_data)
 
         # Evaluate variables in the data
         VariableEvaluator.evaluate_dict(data, variables)
 
-        # Update model with evaluated values
+        # Update model with evaluated values, validated once as a whole instead of re-running
+        # the assignment validators per field
         updated_data = self.model_validate(data)
-        for k, v in updated_data.__dict__.items():
-            if k.startswith("_") or k in ["model_config", "model_fields"]:
-                continue
-            setattr(self, k, v)
+        self.__dict__.update(updated_data.__dict__)
 
     def model_dump(self, **kwargs) -> dict[str, Any]:
         """Convert the model to a dictionary.
@@ -257,7 +261,7 @@ class DslTest(BaseModel):
         Returns:
             dict: The test instance as a dictionary
         """
-        return {k: v for k, v in self.model_dump().items() if v is not None}
+        return self.model_dump(exclude_none=True)
 
     def get_needs(self) -> list[str]:
         """Get the needs of the test."""
@@ -4,12 +4,14 @@ Test runner implementations.
 
 import copy
 import sys
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
-from octopus.dsl.constants import TEST_RUNNER_FIELDS, HttpMethod, TestMode
+from octopus.dsl.constants import TEST_RUNNER_FIELD_SETS, TEST_RUNNER_FIELDS, HttpMethod, TestMode
 from octopus.dsl.interface import RunnerInterface
 from octopus.dsl.variable import VariableEvaluator
 
@@ -40,6 +42,12 @@ class BaseRunner(BaseModel, RunnerInterface):
         """
         return self.model_dump()
 
+    def _require_fields(self, mode: TestMode, runner: str) -> None:
+        """Raise ValueError if a required runner field of the mode is missing."""
+        # field values live in __dict__, the same keys get_config() dumps, without serializing the model
+        if not TEST_RUNNER_FIELD_SETS[mode] <= self.__dict__.keys():
+            raise ValueError(f"{runner} runner requires fields: {TEST_RUNNER_FIELDS[mode]}")
+
     def get_command(self) -> str:
         """Get the executable command string.
 
@@ -98,6 +106,10 @@ class ShellRunner(BaseRunner):
         return " ".join(self.cmd)
 
 
+# methods the curl command sends without a payload
+_BODYLESS_METHODS = frozenset((HttpMethod.GET, HttpMethod.DELETE))
+
+
 class HttpRunner(BaseRunner):
     """HTTP request test runner."""
 
@@ -114,18 +126,11 @@ class HttpRunner(BaseRunner):
         Returns:
             str: The curl command string
         """
-        required = TEST_RUNNER_FIELDS[TestMode.HTTP]
-        if not all(field in self.get_config() for field in required):
-            raise ValueError(f"HTTP runner requires fields: {required}")
+        self._require_fields(TestMode.HTTP, "HTTP")
 
-        cmd = ["curl"]
-        if self.header:
-            cmd.extend(["-H", f"""'{self.header}'"""])
-        cmd.extend(["-X", self.method])
-        if self.payload and self.method not in [HttpMethod.GET, HttpMethod.DELETE]:
-            cmd.extend(["-d", f"'{self.payload}'"])
-        cmd.append(f"'{self.endpoint}'")
-        return " ".join(cmd)
+        header = f"-H '{self.header}' " if self.header else ""
+        payload = f"-d '{self.payload}' " if self.payload and self.method not in _BODYLESS_METHODS else ""
+        return f"curl {header}-X {self.method.value} {payload}'{self.endpoint}'"
 
 
 class GrpcRunner(BaseRunner):
@@ -144,16 +149,10 @@ class GrpcRunner(BaseRunner):
         Returns:
             str: The grpcurl command string
         """
-        required = TEST_RUNNER_FIELDS[TestMode.GRPC]
-        if not all(field in self.get_config() for field in required):
-            raise ValueError(f"gRPC runner requires fields: {required}")
+        self._require_fields(TestMode.GRPC, "gRPC")
 
-        cmd = ["grpcurl"]
-        cmd.extend(["-proto", self.proto]) if self.proto else None
-        cmd.extend(["-d", f"'{self.payload}'"])
-        cmd.extend(["-plaintext", self.endpoint])
-        cmd.append(self.function)
-        return " ".join(cmd)
+        proto = f"-proto {self.proto} " if self.proto else ""
+        return f"grpcurl {proto}-d '{self.payload}' -plaintext {self.endpoint} {self.function}"
 
 
 class PytestRunner(BaseRunner):
@@ -170,16 +169,11 @@ class PytestRunner(BaseRunner):
         Returns:
             str: The pytest command string
         """
-        required = TEST_RUNNER_FIELDS[TestMode.PYTEST]
-        if not all(field in self.get_config() for field in required):
-            raise ValueError(f"Pytest runner requires fields: {required}")
+        self._require_fields(TestMode.PYTEST, "Pytest")
 
-        cmd = ["pytest"]
-        if self.root_dir:
-            cmd.extend(["--rootdir", self.root_dir])
-        if self.test_args:
-            cmd.extend(self.test_args)
-        return " ".join(cmd)
+        root_dir = f" --rootdir {self.root_dir}" if self.root_dir else ""
+        test_args = f" {' '.join(self.test_args)}" if self.test_args else ""
+        return f"pytest{root_dir}{test_args}"
 
 
 class DockerRunner(BaseRunner):
@@ -196,11 +190,23 @@ class DockerRunner(BaseRunner):
         Returns:
             str: The docker command string
         """
-        if "cntr_name" not in self.get_config():
+        config = self.get_config()
+        if "cntr_name" not in config:
             raise ValueError("Docker runner requires 'cntr_name' in config")
-        if "cmd" not in self.get_config():
+        if "cmd" not in config:
             raise ValueError("Docker runner requires 'cmd' in config")
-        return "docker exec " + self.cntr_name + " " + " ".join(self.cmd)
+        return f"docker exec {self.cntr_name} {' '.join(self.cmd)}"
+
+
+RUNNER_TYPES: Mapping[TestMode, type[BaseRunner]] = MappingProxyType(
+    {
+        TestMode.SHELL: ShellRunner,
+        TestMode.HTTP: HttpRunner,
+        TestMode.GRPC: GrpcRunner,
+        TestMode.PYTEST: PytestRunner,
+        TestMode.DOCKER: DockerRunner,
+    }
+)
 
 
 def create_runner(mode: TestMode, config: dict[str, Any]) -> RunnerInterface:
@@ -216,15 +222,8 @@ def create_runner(mode: TestMode, config: dict[str, Any]) -> RunnerInterface:
     Raises:
         ValueError: If mode is not supported
     """
-    runners: dict[TestMode, type[RunnerInterface]] = {
-        TestMode.SHELL: ShellRunner,
-        TestMode.HTTP: HttpRunner,
-        TestMode.GRPC: GrpcRunner,
-        TestMode.PYTEST: PytestRunner,
-        TestMode.DOCKER: DockerRunner,
-    }
-
-    if mode not in runners:
+    runner_type = RUNNER_TYPES.get(mode)
+    if runner_type is None:
         raise ValueError(f"Unsupported test mode: {mode}")
 
-    return runners[mode](**config)
+    return runner_type(**config)
@@ -39,6 +39,10 @@ def test_expect_validate_fields():
     with pytest.raises(ValueError):
         Expect(mode=TestMode.SHELL)
 
+    # Test a field given as None is missing
+    with pytest.raises(ValueError, match=r"\['response'\]"):
+        Expect(mode=TestMode.HTTP, status_code=200, response=None)
+
     # Test with all required fields
     expect = Expect(
         mode=TestMode.SHELL,
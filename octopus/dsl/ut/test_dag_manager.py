@@ -1,5 +1,6 @@
 """Unit tests for DAGManager class."""
 
+import sys
 import tempfile
 from pathlib import Path
 
@@ -199,6 +200,8 @@ def test_invalid_dag_topological_sort(cyclic_config):
     dag_manager = DAGManager(cyclic_config)
     with pytest.raises(ValueError, match="Cannot perform topological sort on a graph with cycles"):
         dag_manager.get_topological_order()
+    # the cycle is reported as a list of edges
+    assert dag_manager._find_cycle()
 
 
 def test_yaml_config():
@@ -445,3 +448,93 @@ def test_dag_manager_topological_sort(sample_config):
             for _, test in dag_manager._full_graph.out_edges(node):
                 if dag_manager._full_graph.edges[node, test].get("type") == "trigger":
                     assert order.index(test) > i
+
+
+def test_dag_manager_subgraph_cache(sample_config):
+    """Test subgraph is cached until allowed edge types change."""
+    dag_manager = DAGManager(sample_config)
+    subgraph = dag_manager._gen_subgraph()
+    assert dag_manager._gen_subgraph() is subgraph
+
+    dag_manager.allowed_edge_types = ["next", "trigger", "needs"]
+    needs_subgraph = dag_manager._gen_subgraph()
+    assert needs_subgraph is not subgraph
+    assert any(attrs.get("type") == "needs" for _, _, attrs in needs_subgraph.edges(data=True))
+
+
+def test_dag_manager_build_rich_tree():
+    """Test rich tree building expands a shared subtree once."""
+    from rich.tree import Tree
+
+    graph = DiGraph()
+    graph.add_edges_from([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("d", "e")])
+    tree = Tree("a")
+    DAGManager._build_rich_tree(graph, "a", tree)
+
+    (root,) = tree.children
+    b, c = root.children
+    assert [child.label for child in b.children] == ["unknown: d"]
+    assert [child.label for child in b.children[0].children] == ["unknown: e"]
+    # d was reached through b already, listed under c without its subtree
+    assert [child.label for child in c.children] == ["unknown: d"]
+    assert c.children[0].children == []
+
+
+def test_dag_manager_add_edge_incremental(valid_config):
+    """Test adding edges updates the cached topological order incrementally."""
+    dag_manager = DAGManager(valid_config)
+    order = dag_manager.get_topological_order()
+    assert order.index("test_1") < order.index("test_3")
+
+    # test_1 has to move after test_3 now
+    dag_manager.add_edge("test_3", "test_1", "next")
+    order = dag_manager.get_topological_order()
+    assert order.index("test_3") < order.index("test_1")
+    assert order.index("service_1") < order.index("service_2") < order.index("service_3")
+
+    # closes service_1 -> service_2 -> service_3 -> test_3 -> service_1
+    dag_manager.add_edge("test_3", "service_1", "trigger")
+    assert not dag_manager.is_valid_dag()
+
+    with pytest.raises(ValueError):
+        dag_manager.add_edge("test_1", "missing", "next")
+    with pytest.raises(ValueError):
+        dag_manager.add_edge("test_1", "test_2", "invalid_type")
+
+
+def test_dag_manager_add_service(valid_config):
+    """Test adding a service, a trigger of a non-existent test leaves the graph unchanged."""
+    dag_manager = DAGManager(valid_config)
+    order = dag_manager.get_topological_order()
+    nodes, edges = set(dag_manager._full_graph.nodes), set(dag_manager._full_graph.edges)
+
+    bad = DslService(name="service_4", desc="Service 4", image="nginx:latest", trigger=["missing"])
+    with pytest.raises(ValueError, match="triggers non-existent Test missing"):
+        dag_manager.add_service(bad)
+    assert set(dag_manager._full_graph.nodes) == nodes
+    assert set(dag_manager._full_graph.edges) == edges
+    assert "service_4" not in dag_manager._service_names
+    assert dag_manager.get_topological_order() == order
+
+    # the rejected name is still free
+    svc = DslService(name="service_4", desc="Service 4", image="nginx:latest", next=["service_1"])
+    dag_manager.add_service(svc)
+    assert dag_manager._full_graph.has_edge("service_4", "service_1")
+    order = dag_manager.get_topological_order()
+    assert order.index("service_4") < order.index("service_1")
+    with pytest.raises(ValueError, match="already exists"):
+        dag_manager.add_service(svc)
+
+
+def test_dag_manager_long_next_chain():
+    """Test execution plan of a next chain longer than the recursion limit."""
+    n = sys.getrecursionlimit() + 100
+    services = [
+        DslService(name=f"service{i}", desc=f"Service {i}", image="nginx:latest", next=[f"service{i + 1}"])
+        for i in range(n - 1)
+    ]
+    services.append(DslService(name=f"service{n - 1}", desc="Last service", image="nginx:latest"))
+    config = DslConfig(version="0.1.0", name="test_config", desc="Test configuration", services=services, tests=[])
+
+    plan = DAGManager(config).generate_execution_plan()
+    assert plan == [f"service{i}" for i in range(n)]
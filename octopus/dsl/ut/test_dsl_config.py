@@ -4,8 +4,11 @@ from pathlib import Path
 
 import pytest
 import yaml
+from pydantic import ValidationError
 
 from octopus.dsl.dsl_config import DslConfig
+from octopus.dsl.dsl_service import DslService
+from octopus.dsl.runner import ShellRunner
 from octopus.dsl.variable import Variable
 
 
@@ -176,6 +179,15 @@ def test_load_invalid_config_file(tmp_path: Path):
     assert config is None
 
 
+def test_load_unsupported_version_header(tmp_path: Path):
+    """Test an unsupported version in the file header is rejected before the full parse."""
+    yaml_file = tmp_path / "unsupported.yaml"
+    # the rest of the file is not valid YAML, so only the header check can raise ValueError
+    yaml_file.write_text('version: "9.9.9"\nname: x\ninvalid: yaml: content: [')
+    with pytest.raises(ValueError, match="Unsupported version: 9.9.9"):
+        DslConfig.from_yaml_file(yaml_file)
+
+
 def test_load_nonexistent_config_file(tmp_path: Path):
     """Test loading a non-existent config file."""
     nonexistent_yaml = tmp_path / "nonexistent.yaml"
@@ -465,6 +477,90 @@ def test_service_next_validation_valid_service(valid_config: dict):
     assert config.verify()
 
 
+def test_syntax_check():
+    """Test the syntax check walks nested keywords and skips inputs."""
+    DslConfig._syntax_check({"services": [{"name": "s", "envs": ["A=1"]}], "inputs": [{"any_key": {"x": 1}}]})
+    with pytest.raises(ValueError, match="Syntax error: invalid keyword 'bad_key'"):
+        DslConfig._syntax_check({"services": [{"name": "s", "bad_key": 1}]})
+
+
+def test_dag_built_lazily(valid_config: dict):
+    """Test the DAG is built on first use, not on construction."""
+    config = DslConfig.from_dict(valid_config)
+    assert config._dag is None
+    dag_manager = config._dag_manger
+    assert dag_manager is config._dag_manger
+
+    config.evaluate({})
+    assert config._dag is None
+
+
+def test_verify_cached(valid_config: dict):
+    """Test a passed semantic check is cached until a field is reassigned."""
+    config = DslConfig.from_dict(valid_config)
+    assert config._verified
+    assert config.verify()
+
+    config.services = [*config.services, DslService(name="service3", desc="Bad next", image="x", next=["missing"])]
+    assert not config._verified
+    with pytest.raises(ValueError, match="semantic check failed"):
+        config.verify()
+
+
+def test_gen_execution_plan_cached(valid_config: dict):
+    """Test the execution plan is cached until the DAG is rebuilt."""
+    config = DslConfig.from_dict(valid_config)
+    plan = config.gen_execution_plan()
+    assert config._plan_cache is plan
+    assert config.gen_execution_plan() is plan
+
+    config.evaluate({})
+    assert config._plan_cache is None
+    assert config.gen_execution_plan() == plan
+
+
+def test_reassign_services_rebuilds_plan(valid_config: dict):
+    """Test reassigning services invalidates the lookups, DAG and plan built for the old services."""
+    config = DslConfig.from_dict(valid_config)
+    plan = config.gen_execution_plan()
+    dag_manager = config._dag_manger
+
+    service = DslService(
+        name="service3", desc="Service 3", image="nginx:latest", next=["service1"], trigger=["test_shell"]
+    )
+    config.services = [*config.services, service]
+    assert config.get_service_by_name("service3") is service
+    assert config._dag is None
+    new_plan = config.gen_execution_plan()
+    assert new_plan != plan
+    assert ">>> service 'service3'" in new_plan
+    assert config._dag_manger is not dag_manager
+
+    with pytest.raises(ValueError, match="Duplicate service name found: service3"):
+        config.services = [*config.services, service]
+
+
+def test_failed_reassignment_leaves_config_unchanged(valid_config: dict):
+    """Test a reassigned field is validated before it is stored, a failed assignment changes nothing."""
+    config = DslConfig.from_dict(valid_config)
+    services, services_dict, plan = config.services, config._services_dict, config.gen_execution_plan()
+
+    with pytest.raises(ValueError, match="Duplicate service name found: service1"):
+        config.services = [services[1], services[1]]
+    with pytest.raises(ValidationError):
+        config.services = 5
+    with pytest.raises(ValidationError, match="Unsupported version"):
+        config.version = "9.9"
+    assert config.services is services
+    assert config._services_dict is services_dict
+    assert config.version == "0.1.0"
+    assert config.gen_execution_plan() is plan
+
+    # values are validated as on construction
+    config.services = [*services, {"name": "service3", "desc": "Service 3", "image": "nginx:latest"}]
+    assert isinstance(config.get_service_by_name("service3"), DslService)
+
+
 def test_service_next_validation_cycle(valid_config: dict):
     """Test service next validation with cycle."""
     # create cycle dependency, pass semantic check, will fail at DAG validation
@@ -592,6 +688,24 @@ def test_dsl_config_verify(sample_yaml_data):
         DslConfig.from_dict(invalid_config_data)
 
 
+def test_transform_services_and_tests(sample_yaml_data):
+    """Test the list transforms build fully initialized models and pass instances through."""
+    existing = DslService(name="service3", desc="Service 3", image="nginx:latest")
+    services = DslConfig._transform_services([*sample_yaml_data["services"], existing, "skipped"])
+    assert [s.name for s in services] == ["${$service_name}", "service2-${$cntr_name}", "service3"]
+    assert services[2] is existing
+    # the custom __init__ ran, the original data is kept for evaluate()
+    services[0].evaluate({"$service_name": "svc", "$cntr_name": "c"})
+    assert (services[0].name, services[0].next) == ("svc", ["service2-c"])
+
+    tests = DslConfig._transform_tests(sample_yaml_data["tests"])
+    assert isinstance(tests[0].runner, ShellRunner)
+    assert tests[0].expect.mode == "shell"
+
+    with pytest.raises(ValueError, match="Service name is required"):
+        DslConfig._transform_services([{"desc": "No name", "image": "nginx:latest"}])
+
+
 def test_dsl_config_input_transformation(sample_yaml_data):
     """Test input transformation."""
     config = DslConfig.from_dict(sample_yaml_data)
@@ -306,6 +306,15 @@ def test_dsl_service_idempotent_evaluation(sample_service_data):
     assert first_result == third_result
 
 
+def test_dsl_service_static_evaluation(sample_service_data):
+    """Test that a service without variable placeholders is left as is."""
+    service = DslService.from_dict(sample_service_data)
+    before = service.model_dump()
+
+    service.evaluate({"service_name": "service2"})
+    assert service.model_dump() == before
+
+
 def test_dsl_service_get_command(sample_service_data):
     """Test getting service command."""
     service = DslService.from_dict(sample_service_data)
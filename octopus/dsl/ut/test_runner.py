@@ -282,6 +282,13 @@ def test_grpc_runner(grpc_runner_data):
     assert runner.get_command() == 'grpcurl -d \'{"name": "World"}\' -plaintext localhost:50051 hello.Greeter/SayHello'
 
 
+def test_runner_missing_required_field():
+    """Test get_command() rejects a runner built without a required field."""
+    runner = GrpcRunner.model_construct(function="hello.Greeter/SayHello", payload="{}")
+    with pytest.raises(ValueError, match="gRPC runner requires fields"):
+        runner.get_command()
+
+
 def test_pytest_runner(pytest_runner_data):
     """Test pytest runner functionality."""
     runner = PytestRunner(**pytest_runner_data)
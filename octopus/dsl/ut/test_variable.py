@@ -2,7 +2,7 @@
 
 import pytest
 
-from octopus.dsl.variable import Variable
+from octopus.dsl.variable import Variable, VariableEvaluator
 
 
 @pytest.fixture
@@ -99,3 +99,13 @@ def test_variable_str_representation(normal_variable, lazy_variable):
     # Test lazy variable string representation
     assert str(lazy_variable) == "$cntr_name: service_container"
     assert repr(lazy_variable) == "Variable(key='$cntr_name', value='service_container')"
+
+
+def test_clone_collection_isolates_evaluation():
+    """Test evaluating a cloned collection leaves the original untouched."""
+    origin = {"name": "${svc}", "runner": {"cmd": ["echo", "${svc}"], "env": {"A": "${svc}"}}, "retry": 1}
+    data = VariableEvaluator.clone_collection(origin)
+    VariableEvaluator.evaluate_dict(data, {"svc": "service1"})
+
+    assert data == {"name": "service1", "runner": {"cmd": ["echo", "service1"], "env": {"A": "service1"}}, "retry": 1}
+    assert origin == {"name": "${svc}", "runner": {"cmd": ["echo", "${svc}"], "env": {"A": "${svc}"}}, "retry": 1}
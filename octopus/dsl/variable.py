@@ -1,3 +1,4 @@
+import copy
 import re
 from typing import Any
 
@@ -90,6 +91,17 @@ class VariableEvaluator:
                     value = value.replace(match.group(0), str(variables[var_key]))
         return value
 
+    @staticmethod
+    def clone_collection(collection: Any) -> Any:
+        """copy the dicts and lists evaluate_collection writes into, share immutable scalars"""
+        if isinstance(collection, dict):
+            return {key: VariableEvaluator.clone_collection(value) for key, value in collection.items()}
+        if isinstance(collection, list):
+            return [VariableEvaluator.clone_collection(item) for item in collection]
+        if collection is None or isinstance(collection, str | int | float | bool):
+            return collection
+        return copy.deepcopy(collection)
+
     @staticmethod
     def evaluate_dict(data: dict[str, Any], variables: dict[str, Any]) -> None:
         """evaluate dict with given variables"""
@@ -0,0 +1,70 @@
+"""In-memory TTL cache for CI platform metadata."""
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Cache whose entries expire `ttl` seconds after being stored.
+
+    Expired entries are refreshed inline on the next lookup, the oldest entry is
+    evicted once `maxsize` is reached. The cache is shared by the executor threads of
+    the adapters, its entries are read and written under a lock.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            maxsize: Max number of entries
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a valid entry, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            created_at, value = entry
+            if time.monotonic() - created_at >= self.ttl:
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an entry."""
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic(), value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get a valid entry, or create it by factory and store it.
+
+        The factory runs outside the lock, concurrent misses of the same key may each call it.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop an entry."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
@@ -1,8 +1,23 @@
 """Base classes for CI platform adapters."""
 
+import asyncio
+import os
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any
 
+import aiohttp
+
+# Pipeline statuses that will not change any more
+PIPELINE_FINISHED_STATUSES = frozenset({"success", "failed", "canceled", "skipped", "completed"})
+
+# Backoff of the fallback status polling, in seconds
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 30.0
+
+# Max in-flight API requests per adapter, keeps fan-out under the platform rate limits
+MAX_CONCURRENT_API_OPS = int(os.getenv("MAX_CONCURRENT_API_OPS", "8"))
+
 
 class CIAdapter(ABC):
     """Base class for CI platform adapters."""
@@ -16,6 +31,47 @@ class CIAdapter(ABC):
         """
         self.api_url = api_url
         self.token = token
+        # asyncio primitives and sessions are bound to one event loop, they are kept per running loop
+        self._api_sems: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession] = (
+            weakref.WeakKeyDictionary()
+        )
+        # in-flight status requests keyed by (pipeline ID, fresh), shared by concurrent callers
+        self._inflights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, bool], asyncio.Future[dict[str, Any]]]
+        ] = weakref.WeakKeyDictionary()
+
+    def _auth_headers(self) -> dict[str, str]:
+        """Get the authentication headers of HTTP API requests."""
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def _get_api_sem(self) -> asyncio.Semaphore:
+        """Get the semaphore capping in-flight API requests of the running event loop."""
+        loop = asyncio.get_running_loop()
+        sem = self._api_sems.get(loop)
+        if sem is None:
+            sem = self._api_sems[loop] = asyncio.Semaphore(MAX_CONCURRENT_API_OPS)
+        return sem
+
+    def _get_inflight(self) -> dict[tuple[str, bool], asyncio.Future[dict[str, Any]]]:
+        """Get the in-flight status requests of the running event loop."""
+        return self._inflights.setdefault(asyncio.get_running_loop(), {})
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session of the running event loop, keep-alive connections are reused across requests."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = aiohttp.ClientSession(headers=self._auth_headers())
+        return session
+
+    async def close(self) -> None:
+        """Close the HTTP session of the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
 
     @abstractmethod
     def get_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
@@ -36,3 +92,79 @@ class CIAdapter(ABC):
     def get_job_logs(self, job_id: str) -> str:
         """Get job logs."""
         pass
+
+    def get_fresh_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
+        """Get pipeline status from the platform, adapters caching statuses bypass their cache.
+
+        Args:
+            pipeline_id: Pipeline ID
+
+        Returns:
+            Dictionary containing pipeline status information
+        """
+        return self.get_pipeline_status(pipeline_id)
+
+    async def _fetch_pipeline_status(self, pipeline_id: str, *, fresh: bool = False) -> dict[str, Any]:
+        """Get pipeline status off the event loop, concurrent callers share one in-flight request.
+
+        Args:
+            pipeline_id: Pipeline ID
+            fresh: Bypass the status cache of the adapter
+
+        Returns:
+            Dictionary containing pipeline status information
+        """
+        key = (pipeline_id, fresh)
+        inflight = self._get_inflight()
+        future = inflight.get(key)
+        if future is None:
+            get_status = self.get_fresh_pipeline_status if fresh else self.get_pipeline_status
+
+            async def _fetch() -> dict[str, Any]:
+                async with self._get_api_sem():
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(None, get_status, pipeline_id)
+
+            future = asyncio.ensure_future(_fetch())
+            inflight[key] = future
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def await_pipeline(self, pipeline_id: str, timeout_s: float = 50) -> dict[str, Any]:
+        """Wait until the pipeline finishes or timeout expires.
+
+        Falls back to polling get_fresh_pipeline_status with exponential backoff, adapters
+        supporting long-polling or event subscription should override it.
+
+        Args:
+            pipeline_id: Pipeline ID
+            timeout_s: Max seconds to wait
+
+        Returns:
+            The last seen pipeline status
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        delay = POLL_INITIAL_DELAY
+        while True:
+            status = await self._fetch_pipeline_status(pipeline_id, fresh=True)
+            remaining = deadline - loop.time()
+            if (status or {}).get("status") in PIPELINE_FINISHED_STATUSES or remaining <= 0:
+                return status
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, POLL_MAX_DELAY)
+
+    async def fetch_many(self, pipeline_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Get status of many pipelines concurrently.
+
+        The blocking get_pipeline_status calls are fanned out to the default thread pool,
+        bounded by MAX_CONCURRENT_API_OPS.
+
+        Args:
+            pipeline_ids: Pipeline IDs
+
+        Returns:
+            Pipeline status keyed by pipeline ID
+        """
+        results = await asyncio.gather(*(self._fetch_pipeline_status(pipeline_id) for pipeline_id in pipeline_ids))
+        return dict(zip(pipeline_ids, results, strict=True))
@@ -1,3 +1,5 @@
+import asyncio
+import weakref
 from typing import Any
 
 from octopus.ext_api.base import CIAdapter
@@ -8,6 +10,55 @@ class GitHubAdapter(CIAdapter):
 
     def __init__(self, api_url: str, token: str):
         super().__init__(api_url, token)
+        # workflow runs completion notified by webhook, keyed by run id, the events are kept per running loop
+        self._pipeline_events: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Event]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._pipeline_results: dict[str, dict[str, Any]] = {}
+
+    def _get_pipeline_event(self, pipeline_id: str) -> asyncio.Event:
+        """Get the completion event of a workflow run in the running event loop."""
+        events = self._pipeline_events.setdefault(asyncio.get_running_loop(), {})
+        return events.setdefault(pipeline_id, asyncio.Event())
+
+    def handle_webhook(self, payload: dict[str, Any]) -> None:
+        """Handle a GitHub `workflow_run` webhook payload, must be called in the event loop thread.
+
+        Args:
+            payload: Webhook payload
+        """
+        run = payload.get("workflow_run")
+        if run is None or payload.get("action") != "completed":
+            return
+        pipeline_id = str(run["id"])
+        self._pipeline_results[pipeline_id] = {
+            "id": run["id"],
+            "status": run.get("conclusion") or run.get("status"),
+            "ref": run.get("head_branch"),
+            "sha": run.get("head_sha"),
+            "created_at": run.get("created_at"),
+            "updated_at": run.get("updated_at"),
+        }
+        self._get_pipeline_event(pipeline_id).set()
+
+    async def await_pipeline(self, pipeline_id: str, timeout_s: float = 50) -> dict[str, Any]:
+        """Wait for the webhook notifying the workflow run completion, no polling.
+
+        Args:
+            pipeline_id: Workflow run ID
+            timeout_s: Max seconds to wait
+
+        Returns:
+            The workflow run status, status is 'pending' if not completed before timeout
+        """
+        # completed before, possibly notified in another event loop
+        if pipeline_id in self._pipeline_results:
+            return self._pipeline_results[pipeline_id]
+        try:
+            await asyncio.wait_for(self._get_pipeline_event(pipeline_id).wait(), timeout_s)
+        except asyncio.TimeoutError:
+            pass
+        return self._pipeline_results.get(pipeline_id, {"id": pipeline_id, "status": "pending"})
 
     def get_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
         """Get GitHub pipeline status."""
@@ -2,11 +2,17 @@
 GitLab CI integration implementation
 """
 
+import asyncio
 from typing import Any
 
 import gitlab
 
-from octopus.ext_api.base import CIAdapter
+from octopus.ext_api._cache import TTLCache
+from octopus.ext_api.base import PIPELINE_FINISHED_STATUSES, POLL_INITIAL_DELAY, POLL_MAX_DELAY, CIAdapter
+
+# Projects are immutable metadata, pipeline status changes quickly
+PROJECT_CACHE_TTL = 3600
+PIPELINE_STATUS_CACHE_TTL = 30
 
 
 class GitLabRunner:
@@ -28,10 +34,38 @@ class GitLabAdapter(CIAdapter):
         """
         super().__init__(api_url, token)
         self.client = gitlab.Gitlab(api_url, private_token=token)
+        self._project_cache = TTLCache(ttl=PROJECT_CACHE_TTL)
+        self._status_cache = TTLCache(ttl=PIPELINE_STATUS_CACHE_TTL)
+
+    def _auth_headers(self) -> dict[str, str]:
+        """Get the GitLab API authentication headers."""
+        return {"PRIVATE-TOKEN": self.token}
+
+    def _get_project(self, project_id: str) -> Any:
+        """Get GitLab project, cached for PROJECT_CACHE_TTL seconds.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            The GitLab project object
+        """
+        return self._project_cache.get_or_set(project_id, lambda: self.client.projects.get(project_id))
 
     def get_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
         """Get GitLab pipeline status.
 
+        Args:
+            pipeline_id: Pipeline ID
+
+        Returns:
+            Dictionary containing pipeline status information, cached for PIPELINE_STATUS_CACHE_TTL seconds
+        """
+        return self._status_cache.get_or_set(pipeline_id, lambda: self.get_fresh_pipeline_status(pipeline_id))
+
+    def get_fresh_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
+        """Get GitLab pipeline status from the server, the status cache is refreshed.
+
         Args:
             pipeline_id: Pipeline ID
 
@@ -39,7 +73,7 @@ class GitLabAdapter(CIAdapter):
             Dictionary containing pipeline status information
         """
         pipeline = self.client.pipelines.get(pipeline_id)
-        return {
+        status = {
             "id": pipeline.id,
             "status": pipeline.status,
             "ref": pipeline.ref,
@@ -47,6 +81,48 @@ class GitLabAdapter(CIAdapter):
             "created_at": pipeline.created_at,
             "updated_at": pipeline.updated_at,
         }
+        self._status_cache.set(pipeline_id, status)
+        return status
+
+    async def await_pipeline(
+        self, pipeline_id: str, timeout_s: float = 50, *, project_id: str | None = None
+    ) -> dict[str, Any]:
+        """Wait until the GitLab pipeline finishes or timeout expires.
+
+        GitLab serves pipeline endpoints with ETag caching, conditional requests over one
+        kept-alive connection are answered with a cheap 304 until the pipeline changes.
+
+        Args:
+            pipeline_id: Pipeline ID
+            timeout_s: Max seconds to wait
+            project_id: Project ID of the pipeline, fall back to status polling if not given
+
+        Returns:
+            The last seen pipeline status
+        """
+        if project_id is None:
+            return await super().await_pipeline(pipeline_id, timeout_s)
+
+        url = f"{self.api_url.rstrip('/')}/api/v4/projects/{project_id}/pipelines/{pipeline_id}"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        delay = POLL_INITIAL_DELAY
+        etag, status = None, {}
+        session = self._get_session()
+        while True:
+            headers = {"If-None-Match": etag} if etag else {}
+            async with self._get_api_sem(), session.get(url, headers=headers) as resp:
+                if resp.status != 304:
+                    resp.raise_for_status()
+                    etag = resp.headers.get("ETag")
+                    status = await resp.json()
+                    # status changed, poll again soon
+                    delay = POLL_INITIAL_DELAY
+            remaining = deadline - loop.time()
+            if status.get("status") in PIPELINE_FINISHED_STATUSES or remaining <= 0:
+                return status
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, POLL_MAX_DELAY)
 
     def trigger_pipeline(self, config: dict[str, Any]) -> str:
         """Trigger a new GitLab pipeline.
@@ -57,7 +133,7 @@ class GitLabAdapter(CIAdapter):
         Returns:
             ID of the triggered pipeline
         """
-        project = self.client.projects.get(config["project_id"])
+        project = self._get_project(config["project_id"])
         pipeline = project.pipelines.create(
             {"ref": config.get("ref", "main"), "variables": config.get("variables", {})}
         )
@@ -75,6 +151,7 @@ class GitLabAdapter(CIAdapter):
         try:
             pipeline = self.client.pipelines.get(pipeline_id)
             pipeline.cancel()
+            self._status_cache.invalidate(pipeline_id)
             return True
         except Exception:
             return False
@@ -90,3 +167,27 @@ class GitLabAdapter(CIAdapter):
         """
         job = self.client.jobs.get(job_id)
         return job.trace()
+
+    async def get_job_logs_batch(self, job_ids: list[str], *, project_id: str) -> dict[str, str]:
+        """Get logs of many GitLab jobs concurrently.
+
+        Traces are downloaded over the keep-alive session of the running event loop, bounded by
+        MAX_CONCURRENT_API_OPS, instead of one blocking python-gitlab request per job.
+
+        Args:
+            job_ids: Job IDs
+            project_id: Project ID of the jobs
+
+        Returns:
+            Job logs keyed by job ID
+        """
+        base_url = f"{self.api_url.rstrip('/')}/api/v4/projects/{project_id}/jobs"
+        session = self._get_session()
+
+        async def _fetch(job_id: str) -> str:
+            async with self._get_api_sem(), session.get(f"{base_url}/{job_id}/trace") as resp:
+                resp.raise_for_status()
+                return await resp.text()
+
+        results = await asyncio.gather(*(_fetch(job_id) for job_id in job_ids))
+        return dict(zip(job_ids, results, strict=True))
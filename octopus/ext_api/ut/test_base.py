@@ -0,0 +1,86 @@
+"""Unit tests for CIAdapter base class."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from octopus.ext_api import base
+from octopus.ext_api.base import CIAdapter
+
+
+class FakeAdapter(CIAdapter):
+    """Adapter returning queued pipeline statuses, the last one repeats."""
+
+    def __init__(self, statuses: list[str], delay: float = 0.0):
+        super().__init__("http://ci.invalid", "token")
+        self.statuses = statuses
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_pipeline_status(self, pipeline_id: str) -> dict[str, Any]:
+        """Get the next queued status, blocking like a sync HTTP client."""
+        time.sleep(self.delay)
+        with self._lock:
+            status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+            self.calls += 1
+        return {"id": pipeline_id, "status": status}
+
+    def trigger_pipeline(self, config: dict[str, Any]) -> str:
+        return "1"
+
+    def cancel_pipeline(self, pipeline_id: str) -> bool:
+        return True
+
+    def get_job_logs(self, job_id: str) -> str:
+        return ""
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    """Poll without waiting seconds between requests."""
+    monkeypatch.setattr(base, "POLL_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(base, "POLL_MAX_DELAY", 0.01)
+
+
+def test_fetch_many_shares_inflight_requests():
+    """Test concurrent callers of the same pipeline share one status request."""
+    adapter = FakeAdapter(["running"], delay=0.05)
+
+    results = asyncio.run(adapter.fetch_many(["1", "1", "2"]))
+    assert results == {"1": {"id": "1", "status": "running"}, "2": {"id": "2", "status": "running"}}
+    assert adapter.calls == 2
+
+
+def test_fetch_many_in_many_event_loops(monkeypatch):
+    """Test the request limit and in-flight requests of an adapter work in every event loop it is used in."""
+    monkeypatch.setattr(base, "MAX_CONCURRENT_API_OPS", 1)
+    adapter = FakeAdapter(["running"], delay=0.01)
+
+    async def _run() -> dict[str, dict[str, Any]]:
+        results = await adapter.fetch_many(["1", "2", "3"])
+        assert adapter._get_inflight() == {}
+        return results
+
+    # the semaphore is contended in both loops, a semaphore bound to the first loop fails in the second one
+    assert asyncio.run(_run()) == asyncio.run(_run())
+    assert adapter.calls == 6
+
+
+def test_await_pipeline_polls_until_finished():
+    """Test the fallback polling stops at the first finished status."""
+    adapter = FakeAdapter(["pending", "running", "success", "running"])
+
+    assert asyncio.run(adapter.await_pipeline("1", timeout_s=5)) == {"id": "1", "status": "success"}
+    assert adapter.calls == 3
+
+
+def test_await_pipeline_timeout():
+    """Test the last seen status is returned once the timeout expires."""
+    adapter = FakeAdapter(["running"])
+
+    assert asyncio.run(adapter.await_pipeline("1", timeout_s=0.05)) == {"id": "1", "status": "running"}
+    assert adapter.calls > 1
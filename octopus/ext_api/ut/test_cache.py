@@ -0,0 +1,90 @@
+"""Unit tests for TTLCache class."""
+
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from octopus.ext_api import _cache
+from octopus.ext_api._cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock of the cache, advanced by the test."""
+    now = [0.0]
+    monkeypatch.setattr(_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    """Test an entry is valid for ttl seconds."""
+    cache = TTLCache(ttl=10)
+    cache.set("k", "v")
+
+    clock[0] = 9.9
+    assert cache.get("k") == "v"
+    clock[0] = 10
+    assert cache.get("k", "missing") == "missing"
+
+
+def test_get_or_set_refreshes_expired_entry(clock):
+    """Test the factory only runs for missing or expired entries."""
+    cache = TTLCache(ttl=10)
+    calls = []
+
+    def factory():
+        calls.append(clock[0])
+        return len(calls)
+
+    assert cache.get_or_set("k", factory) == 1
+    assert cache.get_or_set("k", factory) == 1
+    clock[0] = 10
+    assert cache.get_or_set("k", factory) == 2
+    assert calls == [0.0, 10]
+
+
+def test_oldest_entry_evicted(clock):
+    """Test the oldest entry is dropped once maxsize is reached."""
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert (cache.get("b"), cache.get("c")) == (2, 3)
+
+    cache.invalidate("b")
+    assert cache.get("b") is None
+    cache.clear()
+    assert cache.get("c") is None
+
+
+def test_concurrent_access():
+    """Test entries are stored and evicted consistently from many threads."""
+    # switch threads as often as possible so unguarded get/set/evict would interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    cache = TTLCache(ttl=10, maxsize=8)
+    errors = []
+
+    def _worker(n: int) -> None:
+        try:
+            for i in range(20000):
+                cache.set((n, i % 16), i)
+                cache.get((n, i % 16))
+                cache.invalidate((n, i % 3))
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
+    assert len(cache._data) <= cache.maxsize
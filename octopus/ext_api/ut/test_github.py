@@ -0,0 +1,76 @@
+"""Unit tests for GitHubAdapter class."""
+
+import asyncio
+from typing import Any
+
+from octopus.ext_api.github import GitHubAdapter
+
+RUN = {
+    "id": 42,
+    "status": "completed",
+    "conclusion": "success",
+    "head_branch": "main",
+    "head_sha": "abc",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:01:00Z",
+}
+
+
+class WebhookAdapter(GitHubAdapter):
+    """GitHub adapter with the pipeline API methods GitHubAdapter does not implement yet stubbed."""
+
+    def trigger_pipeline(self, config: dict[str, Any]) -> str:
+        return "42"
+
+    def cancel_pipeline(self, pipeline_id: str) -> bool:
+        return True
+
+    def get_job_logs(self, job_id: str) -> str:
+        return ""
+
+
+def test_await_pipeline_woken_by_webhook():
+    """Test a waiting caller is woken by the completed workflow_run webhook, without polling."""
+    adapter = WebhookAdapter("https://api.github.com", "token")
+
+    async def _run() -> dict:
+        waiter = asyncio.ensure_future(adapter.await_pipeline("42", timeout_s=5))
+        await asyncio.sleep(0)
+        adapter.handle_webhook({"action": "in_progress", "workflow_run": {**RUN, "status": "in_progress"}})
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        adapter.handle_webhook({"action": "completed", "workflow_run": RUN})
+        return await waiter
+
+    assert asyncio.run(_run()) == {
+        "id": 42,
+        "status": "success",
+        "ref": "main",
+        "sha": "abc",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:01:00Z",
+    }
+
+
+def test_await_pipeline_timeout():
+    """Test a run without completion webhook is reported as pending."""
+    adapter = WebhookAdapter("https://api.github.com", "token")
+
+    assert asyncio.run(adapter.await_pipeline("7", timeout_s=0.01)) == {"id": "7", "status": "pending"}
+
+
+def test_await_pipeline_in_many_event_loops():
+    """Test a run can be awaited again from another event loop, as the sync manager calls do."""
+    adapter = WebhookAdapter("https://api.github.com", "token")
+    assert asyncio.run(adapter.await_pipeline("42", timeout_s=0.01))["status"] == "pending"
+
+    async def _run() -> dict:
+        waiter = asyncio.ensure_future(adapter.await_pipeline("42", timeout_s=5))
+        # let the waiter block on the completion event before it is set
+        await asyncio.sleep(0.01)
+        adapter.handle_webhook({"action": "completed", "workflow_run": RUN})
+        return await waiter
+
+    assert asyncio.run(_run())["status"] == "success"
+    # the result is kept after the run completed
+    assert asyncio.run(adapter.await_pipeline("42", timeout_s=5))["status"] == "success"
@@ -0,0 +1,167 @@
+"""Unit tests for GitLabAdapter class against a fake GitLab API server."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from octopus.ext_api import base
+from octopus.ext_api.gitlab import GitLabAdapter
+
+
+class FakeGitLab:
+    """Fake GitLab API serving pipeline status with ETags and job traces."""
+
+    def __init__(self, statuses: list[str]):
+        """Initialize the fake server.
+
+        Args:
+            statuses: Pipeline status per poll, a repeated status is answered with 304
+        """
+        self.statuses = statuses
+        self.polls = 0
+        self.requests: list[dict[str, str]] = []
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    async def _pipeline(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        status = self.statuses[min(self.polls, len(self.statuses) - 1)]
+        self.polls += 1
+        etag = f'"{status}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        body = {"id": int(request.match_info["pipeline_id"]), "status": status}
+        return web.json_response(body, headers={"ETag": etag})
+
+    async def _trace(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        return web.Response(text=f"log of job {request.match_info['job_id']}")
+
+    async def __aenter__(self) -> "FakeGitLab":
+        app = web.Application()
+        app.router.add_get("/api/v4/projects/{project_id}/pipelines/{pipeline_id}", self._pipeline)
+        app.router.add_get("/api/v4/projects/{project_id}/jobs/{job_id}/trace", self._trace)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._runner.cleanup()
+
+    def __enter__(self) -> "FakeGitLab":
+        """Serve from a background thread, for code running its own event loops."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return asyncio.run_coroutine_threadsafe(self.__aenter__(), self._loop).result()
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self.__aexit__(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    """Poll without waiting seconds between requests."""
+    monkeypatch.setattr(base, "POLL_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(base, "POLL_MAX_DELAY", 0.01)
+    monkeypatch.setattr("octopus.ext_api.gitlab.POLL_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr("octopus.ext_api.gitlab.POLL_MAX_DELAY", 0.01)
+
+
+def test_await_pipeline_conditional_requests():
+    """Test polling sends the last ETag and keeps the last status on 304 responses."""
+    server = FakeGitLab(["running", "running", "running", "success"])
+
+    async def _run() -> dict:
+        async with server:
+            adapter = GitLabAdapter(server.url, "secret")
+            try:
+                return await adapter.await_pipeline("7", timeout_s=5, project_id="3")
+            finally:
+                await adapter.close()
+
+    assert asyncio.run(_run()) == {"id": 7, "status": "success"}
+    assert server.polls == 4
+    assert [r.get("If-None-Match") for r in server.requests] == [None, '"running"', '"running"', '"running"']
+    assert all(r["PRIVATE-TOKEN"] == "secret" for r in server.requests)
+
+
+def test_await_pipeline_in_many_event_loops():
+    """Test the adapter polls from a new event loop after the loop of a previous call is closed."""
+    with FakeGitLab(["success"]) as server:
+        adapter = GitLabAdapter(server.url, "secret")
+        for _ in range(2):
+            assert asyncio.run(adapter.await_pipeline("7", timeout_s=5, project_id="3"))["status"] == "success"
+    assert server.polls == 2
+
+
+def test_get_job_logs_batch():
+    """Test job traces are downloaded over the shared session."""
+    server = FakeGitLab([])
+
+    async def _run() -> dict[str, str]:
+        async with server:
+            adapter = GitLabAdapter(server.url, "secret")
+            try:
+                return await adapter.get_job_logs_batch(["1", "2"], project_id="3")
+            finally:
+                await adapter.close()
+
+    assert asyncio.run(_run()) == {"1": "log of job 1", "2": "log of job 2"}
+
+
+def test_pipeline_status_cached_until_cancel(monkeypatch):
+    """Test pipeline status is served from the cache, cancel drops the cached entry."""
+    adapter = GitLabAdapter("http://gitlab.invalid", "secret")
+    fetched = []
+
+    def _get(pipeline_id):
+        fetched.append(pipeline_id)
+        return SimpleNamespace(
+            id=pipeline_id,
+            status="running",
+            ref="main",
+            sha="abc",
+            created_at="t0",
+            updated_at="t1",
+            cancel=lambda: None,
+        )
+
+    monkeypatch.setattr(adapter.client, "pipelines", SimpleNamespace(get=_get), raising=False)
+
+    assert adapter.get_pipeline_status("7")["status"] == "running"
+    assert adapter.get_pipeline_status("7")["status"] == "running"
+    assert fetched == ["7"]
+
+    assert adapter.cancel_pipeline("7") is True
+    adapter.get_pipeline_status("7")
+    assert fetched == ["7", "7", "7"]
+
+
+def test_await_pipeline_fallback_bypasses_status_cache(monkeypatch):
+    """Test polling without project ID fetches the status every time instead of reading the cache."""
+    adapter = GitLabAdapter("http://gitlab.invalid", "secret")
+    statuses = iter(["running", "running", "success"])
+
+    def _get(pipeline_id):
+        return SimpleNamespace(
+            id=pipeline_id, status=next(statuses), ref="main", sha="abc", created_at="t0", updated_at="t1"
+        )
+
+    monkeypatch.setattr(adapter.client, "pipelines", SimpleNamespace(get=_get), raising=False)
+
+    assert asyncio.run(adapter.await_pipeline("7", timeout_s=5))["status"] == "success"
+    # the polled status refreshed the cache
+    assert adapter.get_pipeline_status("7")["status"] == "success"
@@ -5,20 +5,39 @@ Container test scheduling execution based on DslConfig
 Supports DAG dependencies and sequential execution
 """
 
+import asyncio
 import time
+from collections.abc import Coroutine
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from octopus.core.container import Container
-from octopus.core.service import Service
+from octopus.core.service import Service, close_docker, gather_in_batches, get_container_pool
 from octopus.dsl.dsl_config import DslConfig
 from octopus.dsl.dsl_service import DslService
 from octopus.dsl.dsl_test import DslTest
 
+T = TypeVar("T")
+
+# seconds a started service is given before its health is checked
+SERVICE_STARTUP_WAIT = 2
+
+
+def _run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from sync code in a new event loop, closing the docker clients of the loop afterwards"""
+
+    async def _main() -> T:
+        try:
+            return await coro
+        finally:
+            await close_docker()
+
+    return asyncio.run(_main())
+
 
 class ExecutionStatus(Enum):
     """Execution status enumeration"""
@@ -33,6 +52,8 @@ class ExecutionStatus(Enum):
 class ExecutionNode(BaseModel):
     """Execution node"""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     name: str
     node_type: str  # "service" or "test"
     status: ExecutionStatus = ExecutionStatus.PENDING
@@ -65,6 +86,8 @@ class TestManager:
         self.running_containers: dict[str, Container] = {}
         self.execution_plan: list[str] = []
         self.execution_history: list[dict[str, Any]] = []
+        # warm containers are reused across runs of the same service, by every manager of the process
+        self.container_pool = get_container_pool()
 
         # Validate configuration
         self._validate_config()
@@ -151,12 +174,18 @@ class TestManager:
         run_args = service.args or []
 
         container = Service(
-            name=service.name, image=service.image, envs=envs, ports=ports, volumes=volumes, run_args=run_args
+            name=service.name,
+            image=service.image,
+            envs=envs,
+            ports=ports,
+            volumes=volumes,
+            run_args=run_args,
+            pool=self.container_pool,
         )
 
         return container
 
-    def _execute_service(self, service_name: str) -> bool:
+    async def _execute_service(self, service_name: str) -> bool:
         """Execute service node"""
         node = self.execution_nodes[service_name]
         service = node.dsl_service
@@ -168,14 +197,14 @@ class TestManager:
 
             # Create and start container
             container = self._create_container_from_service(service)
-            container_id = container.run()
+            container_id = await container.run()
             logger.info(f"Container '{container_id}' started")
 
             # Wait for container to start
-            time.sleep(2)
+            await asyncio.sleep(SERVICE_STARTUP_WAIT)
 
             # Check container status
-            if container.is_healthy():
+            if await container.is_healthy():
                 node.container = container
                 self.running_containers[service_name] = container
                 node.status = ExecutionStatus.SUCCESS
@@ -195,7 +224,7 @@ class TestManager:
             logger.error(f"Service {service_name} execution exception: {e}")
             return False
 
-    def _execute_test(self, test_name: str) -> bool:
+    async def _execute_test(self, test_name: str) -> bool:
         """Execute test node"""
         node = self.execution_nodes[test_name]
         test = node.dsl_test
@@ -211,14 +240,14 @@ class TestManager:
 
             logger.info(f"Executing test command: {command}")
 
-            # Here should actually execute the test command
-            # Temporarily simulate success
-            import subprocess
-
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
+            # run the command without blocking the event loop, concurrent docker operations keep going
+            proc = await asyncio.create_subprocess_shell(
+                command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            await proc.communicate()
 
             # Check test result
-            if result.returncode == test.expect.exit_code:
+            if proc.returncode == test.expect.exit_code:
                 node.status = ExecutionStatus.SUCCESS
                 node.end_time = time.time()
                 logger.info(f"Test {test_name} executed successfully")
@@ -226,7 +255,7 @@ class TestManager:
             else:
                 node.status = ExecutionStatus.FAILED
                 node.error_message = (
-                    f"Test failed, expected exit code: {test.expect.exit_code}, actual: {result.returncode}"
+                    f"Test failed, expected exit code: {test.expect.exit_code}, actual: {proc.returncode}"
                 )
                 node.end_time = time.time()
                 logger.error(f"Test {test_name} execution failed")
@@ -239,66 +268,100 @@ class TestManager:
             logger.error(f"Test {test_name} execution exception: {e}")
             return False
 
-    def _execute_node(self, node_name: str) -> bool:
+    async def _execute_node(self, node_name: str) -> bool:
         """Execute single node"""
         node = self.execution_nodes[node_name]
 
         if node.node_type == "service":
-            return self._execute_service(node_name)
+            return await self._execute_service(node_name)
         elif node.node_type == "test":
-            return self._execute_test(node_name)
+            return await self._execute_test(node_name)
         else:
             logger.error(f"Unknown node type: {node.node_type}")
             return False
 
+    async def _run_node(self, node_name: str) -> bool:
+        """Execute single node and record it in the execution history"""
+        success = await self._execute_node(node_name)
+        node = self.execution_nodes[node_name]
+        self.execution_history.append(
+            {
+                "node_name": node_name,
+                "node_type": node.node_type,
+                "status": node.status.value,
+                "start_time": node.start_time,
+                "end_time": node.end_time,
+                "error_message": node.error_message,
+            }
+        )
+        return success
+
+    async def _start_services(self, service_names: list[str]) -> int:
+        """Start services concurrently batch by batch, return the number of services started"""
+        return sum(await gather_in_batches(self._run_node(name) for name in service_names))
+
     def execute(self) -> bool:
-        """Execute entire test flow"""
+        """Execute entire test flow from sync code, see execute_async"""
+        return _run_sync(self.execute_async())
+
+    async def execute_async(self) -> bool:
+        """Execute entire test flow
+
+        Consecutive services of the plan whose dependencies are already satisfied are started
+        together, batch by batch, the plan order is kept for everything else.
+        """
         logger.info("Starting test flow execution")
         logger.info(f"Execution plan: {self.execution_plan}")
 
         success_count = 0
         total_count = len(self.execution_plan)
+        startable: list[str] = []
 
         for node_name in self.execution_plan:
+            node = self.execution_nodes[node_name]
+            # tests and services depending on the pending services wait for them to start
+            if startable and (node.node_type != "service" or not self._can_execute_node(node_name)):
+                success_count += await self._start_services(startable)
+                startable.clear()
+
             # Check if can execute
             if not self._can_execute_node(node_name):
                 logger.warning(f"Node {node_name} dependencies not satisfied, skipping")
-                self.execution_nodes[node_name].status = ExecutionStatus.SKIPPED
+                node.status = ExecutionStatus.SKIPPED
                 continue
 
-            # Execute node
-            success = self._execute_node(node_name)
-            if success:
+            if node.node_type == "service":
+                startable.append(node_name)
+            elif await self._run_node(node_name):
                 success_count += 1
 
-            # Record execution history
-            node = self.execution_nodes[node_name]
-            self.execution_history.append(
-                {
-                    "node_name": node_name,
-                    "node_type": node.node_type,
-                    "status": node.status.value,
-                    "start_time": node.start_time,
-                    "end_time": node.end_time,
-                    "error_message": node.error_message,
-                }
-            )
+        if startable:
+            success_count += await self._start_services(startable)
 
         logger.info(f"Test flow execution completed: {success_count}/{total_count} successful")
         return success_count == total_count
 
+    async def _cleanup_container(self, container_name: str, container: Container):
+        """Stop and remove a single container"""
+        try:
+            logger.info(f"Cleaning up container: {container_name}")
+            await container.stop()
+            await container.remove()
+        except Exception as e:
+            logger.error(f"Failed to cleanup container {container_name}: {e}")
+
     def cleanup(self):
+        """Clean up resources from sync code, see cleanup_async"""
+        _run_sync(self.cleanup_async())
+
+    async def cleanup_async(self):
         """Clean up resources"""
         logger.info("Starting resource cleanup")
 
-        # Stop and remove all containers
-        for container_name, container in self.running_containers.items():
-            try:
-                logger.info(f"Cleaning up container: {container_name}")
-                container.stop()
-                container.remove()
-            except Exception as e:
-                logger.error(f"Failed to cleanup container {container_name}: {e}")
+        # Stop and remove all containers concurrently, batch by batch
+        await gather_in_batches(
+            self._cleanup_container(name, container) for name, container in self.running_containers.items()
+        )
 
         self.running_containers.clear()
         logger.info("Resource cleanup completed")
@@ -347,9 +410,13 @@ class TestManager:
         self.config.print_execution_dag()
 
     def get_service_logs(self, service_name: str) -> list[str]:
+        """Get service logs from sync code, see get_service_logs_async"""
+        return _run_sync(self.get_service_logs_async(service_name))
+
+    async def get_service_logs_async(self, service_name: str) -> list[str]:
         """Get service logs"""
         if service_name in self.running_containers:
-            return self.running_containers[service_name].get_logs()
+            return await self.running_containers[service_name].get_logs()
         return []
 
     def get_service(self, name: str) -> Container | None:
@@ -381,10 +448,15 @@ def execute_test_from_config(config_path: str | Path) -> bool:
         Whether execution was successful
     """
     manager = create_test_manager_from_config(config_path)
-    try:
-        return manager.execute()
-    finally:
-        manager.cleanup()
+
+    async def _execute() -> bool:
+        try:
+            return await manager.execute_async()
+        finally:
+            await manager.cleanup_async()
+            await close_docker()
+
+    return asyncio.run(_execute())
 
 
 if __name__ == "__main__":
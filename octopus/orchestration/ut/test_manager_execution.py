@@ -0,0 +1,102 @@
+"""Unit tests for TestManager execution against a fake docker daemon."""
+
+import asyncio
+import time
+
+import pytest
+
+from octopus.core.container_pool import ContainerPool
+from octopus.core.service import get_docker
+from octopus.core.ut.fake_docker import FakeDocker
+from octopus.dsl.dsl_config import DslConfig
+from octopus.orchestration import manager as manager_module
+from octopus.orchestration.manager import ExecutionStatus
+
+
+def _service(name: str, **kwargs) -> dict:
+    """Build a service config."""
+    return {"name": name, "desc": name, "image": "nginx:latest", **kwargs}
+
+
+def _shell_test(name: str, cmd: list[str], exit_code: int = 0) -> dict:
+    """Build a shell test config."""
+    return {
+        "name": name,
+        "desc": name,
+        "mode": "shell",
+        "runner": {"cmd": cmd},
+        "expect": {"exit_code": exit_code, "stdout": "", "stderr": ""},
+    }
+
+
+def _manager(services: list[dict], tests: list[dict]) -> manager_module.TestManager:
+    """Create a test manager from service and test configs."""
+    config = {"version": "0.1.0", "name": "cfg", "desc": "cfg", "inputs": [], "services": services, "tests": tests}
+    return manager_module.TestManager(DslConfig.from_dict(config))
+
+
+@pytest.fixture(autouse=True)
+def isolated_manager(monkeypatch):
+    """Check service health right after start, pool containers per test instead of per process."""
+    monkeypatch.setattr(manager_module, "SERVICE_STARTUP_WAIT", 0)
+    monkeypatch.setattr(manager_module, "get_container_pool", lambda: ContainerPool(get_docker))
+
+
+def test_execute_and_cleanup_sync(tmp_path, monkeypatch):
+    """Test the sync execute() and cleanup() run the flow, each in its own event loop."""
+    manager = _manager(
+        [_service("s1", next=["s2"]), _service("s2", trigger=["test_ok"])],
+        [_shell_test("test_ok", ["true"])],
+    )
+
+    with FakeDocker(tmp_path, monkeypatch) as daemon:
+        assert manager.execute() is True
+        assert sorted(daemon.running()) == ["s1", "s2"]
+        assert [entry["node_name"] for entry in manager.execution_history] == ["s1", "s2", "test_ok"]
+
+        # the containers started by execute() are stopped from the new event loop of cleanup()
+        manager.cleanup()
+        assert daemon.running() == []
+        assert manager.running_containers == {}
+
+
+def test_execute_starts_ready_services_together(tmp_path, monkeypatch):
+    """Test consecutive services with satisfied dependencies are started concurrently."""
+    manager = _manager(
+        [_service(name, trigger=["test_all"]) for name in ("s1", "s2", "s3")],
+        [_shell_test("test_all", ["true"])],
+    )
+    # test_all needs every service but is planned right after s1, it is skipped and s2, s3 form one batch
+    assert manager.execution_plan == ["s1", "test_all", "s2", "s3"]
+
+    async def _run() -> None:
+        async with FakeDocker(tmp_path, monkeypatch) as daemon:
+            daemon.create_delay = 0.05
+            await manager.execute_async()
+            await manager.cleanup_async()
+            assert daemon.max_in_flight == 2
+
+    asyncio.run(_run())
+    status = {name: node.status for name, node in manager.execution_nodes.items()}
+    assert status == {
+        "s1": ExecutionStatus.SUCCESS,
+        "s2": ExecutionStatus.SUCCESS,
+        "s3": ExecutionStatus.SUCCESS,
+        "test_all": ExecutionStatus.SKIPPED,
+    }
+
+
+def test_execute_test_does_not_block_event_loop():
+    """Test commands of concurrent tests run in parallel instead of blocking the event loop."""
+    manager = _manager(
+        [_service("s1", trigger=["test_a", "test_b"])],
+        [_shell_test("test_a", ["sleep", "0.3"]), _shell_test("test_b", ["sleep", "0.3"], exit_code=1)],
+    )
+
+    async def _run() -> list[bool]:
+        return await asyncio.gather(manager._execute_test("test_a"), manager._execute_test("test_b"))
+
+    start = time.monotonic()
+    assert asyncio.run(_run()) == [True, False]
+    assert time.monotonic() - start < 0.55
+    assert manager.execution_nodes["test_b"].error_message == "Test failed, expected exit code: 1, actual: 0"